@@ -5,31 +5,72 @@ Supports multiple build methods and custom parameters
 """
 
 import argparse
-import glob
-import shutil
+import fnmatch
+import os
 import subprocess
 import sys
 from pathlib import Path
 
+from scripts.utils import remove_trees
 
-def run_command(command, description, continue_on_error=False):
-    """Run command and handle errors"""
+
+def print_command(command, description):
     print(f"\n{'=' * 50}")
     print(f"Executing: {description}")
     print(f"Command: {' '.join(command)}")
     print(f"{'=' * 50}")
 
+
+def handle_command_failure(description, error, continue_on_error=False):
+    print(f"❌ {description} failed: {error}")
+    if continue_on_error:
+        print("⚠️  Continue with subsequent steps")
+        return False
+    else:
+        sys.exit(1)
+
+
+def run_command(command, description, continue_on_error=False, exec_replace=False):
+    """Run command and handle errors
+
+    With `exec_replace`, the current process is replaced by the command and this
+    function never returns, saving a fork and the Python shutdown of this script.
+    """
+    print_command(command, description)
+
+    if exec_replace:
+        # Buffered output would be lost when the process image is replaced
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.chdir(Path(__file__).parent)
+        try:
+            os.execvp(command[0], command)
+        except OSError as e:
+            print(f"❌ {description} failed: {e}")
+            sys.exit(1)
+
     try:
         subprocess.run(command, check=True, cwd=Path(__file__).parent)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"❌ {description} failed: {e}")
-        if continue_on_error:
-            print("⚠️  Continue with subsequent steps")
-            return False
-        else:
-            sys.exit(1)
+        return handle_command_failure(description, e, continue_on_error)
+
+
+def start_command(command, description):
+    """Start command in the background, use `wait_command` to wait for its result"""
+    print_command(command, description)
+    return subprocess.Popen(command, cwd=Path(__file__).parent)
+
+
+def wait_command(process, description, continue_on_error=False):
+    """Wait for a command started by `start_command` and handle errors"""
+    returncode = process.wait()
+    if returncode == 0:
+        print(f"✅ {description} completed successfully")
+        return True
+    error = subprocess.CalledProcessError(returncode, process.args)
+    return handle_command_failure(description, error, continue_on_error)
 
 
 def clean_previous_builds():
@@ -37,26 +78,29 @@ def clean_previous_builds():
     print("🧹 Clean previous build files...")
     
     project_root = Path(__file__).parent
-    directories_to_clean = ["build", "dist"]
-    patterns_to_clean = ["*.egg-info"]
-    
-    # Delete directories
-    for dir_name in directories_to_clean:
-        dir_path = project_root / dir_name
-        if dir_path.exists():
-            shutil.rmtree(dir_path)
-            print(f"  🗑️  Delete directory: {dir_name}/")
-    
-    # Delete files and directories matching patterns
-    for pattern in patterns_to_clean:
-        for path in glob.glob(str(project_root / pattern)):
-            path_obj = Path(path)
-            if path_obj.is_dir():
-                shutil.rmtree(path_obj)
-                print(f"  🗑️  Delete directory: {path_obj.name}")
-            elif path_obj.is_file():
-                path_obj.unlink()
-                print(f"  🗑️  Delete file: {path_obj.name}")
+    directories_to_clean = ("build", "dist")
+    patterns_to_clean = ("*.egg-info",)
+    
+    # Single pass over the project root, `DirEntry` caches the file type
+    directories_to_delete = []
+    with os.scandir(project_root) as entries:
+        for entry in entries:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if entry.name in directories_to_clean:
+                if is_dir:
+                    directories_to_delete.append((entry.path, f"{entry.name}/"))
+            elif any(fnmatch.fnmatchcase(entry.name, p) for p in patterns_to_clean):
+                # Delete files and directories matching patterns
+                if is_dir:
+                    directories_to_delete.append((entry.path, entry.name))
+                else:
+                    os.unlink(entry.path)
+                    print(f"  🗑️  Delete file: {entry.name}")
+    
+    # Delete directories concurrently
+    remove_trees(path for path, _ in directories_to_delete)
+    for _, display_name in directories_to_delete:
+        print(f"  🗑️  Delete directory: {display_name}")
     
     print("✅ Clean completed")
 
@@ -130,6 +174,8 @@ Build method examples:
   python build_with_config.py --skip-config     # Skip vLLM configuration generation step
   python build_with_config.py --no-clean        # Do not clean previous build files
   python build_with_config.py --test            # Run tests after build (including configuration generation and package building)
+  python build_with_config.py --exec-build      # Exec the build command as the last step, e.g. for one-shot CI builds
+  python build_with_config.py --sequential      # Do not overlap cleanup with configuration generation (for debugging)
         """
     )
     
@@ -151,6 +197,18 @@ Build method examples:
         help="Do not clean previous build files"
     )
     
+    parser.add_argument(
+        "--exec-build",
+        action="store_true",
+        help="Replace this process with the build command (saves a fork, skips the artifact summary, ignored with --test)"
+    )
+    
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run cleanup and configuration generation one after another instead of concurrently"
+    )
+    
     parser.add_argument(
         "--test", 
         action="store_true",
@@ -172,6 +230,13 @@ def main():
     print("🚀 Start vLLM Kubernetes Plugin automatic build process")
     print(f"Build method: {'setup.py' if args.use_setuptools else 'uv'}")
     
+    generate_cmd = [sys.executable, "scripts/generate_package_scanned_info.py"]
+    generate_description = "Generate package scanned information"
+    generate_process = None
+    if not args.skip_config and not args.sequential:
+        # Generation only writes package sources, it can run while build outputs are cleaned
+        generate_process = start_command(generate_cmd, generate_description)
+    
     # Step 1: Clean previous builds
     if not args.no_clean:
         clean_previous_builds()
@@ -179,28 +244,29 @@ def main():
         print("⏭️  Skip cleanup step")
     
     # Step 2: Generate vLLM configuration
-    if not args.skip_config:
-        run_command(
-            [sys.executable, "scripts/generate_package_scanned_info.py"], 
-            "Generate package scanned information",
-            continue_on_error=True  # Configuration generation failure does not abort build
-        )
-    else:
+    # Configuration generation failure does not abort build
+    if args.skip_config:
         print("⏭️  Skip package scanned information generation step")
+    elif generate_process is not None:
+        wait_command(generate_process, generate_description, continue_on_error=True)
+    else:
+        run_command(generate_cmd, generate_description, continue_on_error=True)
     
     # Step 3: Build project
+    # The build is the last step unless tests have to run afterwards
+    exec_replace = args.exec_build and not args.test
     if args.use_setuptools:
         # Use setup.py to build
         build_cmd = [sys.executable, "setup.py", "build"]
         if args.extra_args:
             build_cmd.extend(args.extra_args)
-        run_command(build_cmd, "Build project using setup.py")
+        run_command(build_cmd, "Build project using setup.py", exec_replace=exec_replace)
     else:
         # Use uv to build
         build_cmd = ["uv", "build"]
         if args.extra_args:
             build_cmd.extend(args.extra_args)
-        run_command(build_cmd, "Build project using uv")
+        run_command(build_cmd, "Build project using uv", exec_replace=exec_replace)
 
     print(f"\n{'=' * 50}")
     print("🎉 Build completed!")
@@ -208,11 +274,14 @@ def main():
 
     dist_dir = Path(__file__).parent / "dist"
     if dist_dir.exists():
-        for file in dist_dir.iterdir():
-            if file.is_file():
-                file_size = file.stat().st_size
-                size_str = f"({file_size:,} bytes)" if file_size > 0 else ""
-                print(f"  📦 {file.name} {size_str}")
+        with os.scandir(dist_dir) as entries:
+            for entry in entries:
+                # The file type comes from the directory listing, the size still
+                # takes one `stat` call per file
+                if entry.is_file():
+                    file_size = entry.stat().st_size
+                    size_str = f"({file_size:,} bytes)" if file_size > 0 else ""
+                    print(f"  📦 {entry.name} {size_str}")
     else:
         print("  ⚠️  No dist/ directory found")
 
@@ -3,10 +3,12 @@
 Generate package scanned information for the vllm kubernetes plugin
 """
 
+import argparse
 import json
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Sequence
 from pydantic import BaseModel
 
 # Add the project root to sys.path to allow imports
@@ -14,12 +16,21 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from scripts.utils import (
-    get_package_version,
+    DEFAULT_SCAN_WORKERS,
+    DEFAULT_SKIP_PREFIXES,
     find_logger_modules,
     find_methods_with_request_id,
+    get_package_fingerprint,
+    get_package_version,
     normalized_package_full_name,
 )
 
+CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "vllm-kubernetes-plugin"
+)
+IGNORE_INIT = True
+
 
 class PackageScannedInfo(BaseModel):
     package_name: str
@@ -28,7 +39,11 @@ class PackageScannedInfo(BaseModel):
     methods_with_request_id: List[str]
 
 
-def generate_package_config(package_name: str) -> PackageScannedInfo:
+def generate_package_config(
+    package_name: str,
+    skip_prefixes: Sequence[str] = DEFAULT_SKIP_PREFIXES,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
+) -> PackageScannedInfo:
     """Generate package configuration by scanning the codebase"""
     print(f"Scanning {package_name} codebase for configuration...")
 
@@ -41,7 +56,10 @@ def generate_package_config(package_name: str) -> PackageScannedInfo:
 
     # Find methods with request_id parameters
     methods_with_request_id = find_methods_with_request_id(
-        package_name, ignore_init=True
+        package_name,
+        ignore_init=IGNORE_INIT,
+        skip_prefixes=skip_prefixes,
+        max_workers=max_workers,
     )
     print(
         f"Found {len(methods_with_request_id)} methods containing request_id/req_id parameters"
@@ -58,6 +76,31 @@ def generate_package_config(package_name: str) -> PackageScannedInfo:
     return config
 
 
+def load_cached_package_config(
+    package_name: str, fingerprint: str
+) -> Optional[PackageScannedInfo]:
+    """Load package configuration scanned by a previous run with the same fingerprint"""
+    cache_file = CACHE_DIR / f"{package_name}-{fingerprint}.json"
+    if not cache_file.exists():
+        return None
+    try:
+        return PackageScannedInfo.model_validate_json(cache_file.read_text("utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable cache file {cache_file}: {e}")
+        return None
+
+
+def save_cached_package_config(config: PackageScannedInfo, fingerprint: str) -> None:
+    """Save package configuration so that unchanged packages are not rescanned"""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        write_json_config_file(
+            config, CACHE_DIR / f"{config.package_name}-{fingerprint}.json"
+        )
+    except OSError as e:
+        print(f"Warning: failed to write scan cache: {e}")
+
+
 def write_python_config_file(config: PackageScannedInfo, output_path: Path) -> None:
     """Write configuration as Python module in the format matching vllm_mappings.py"""
     package_name = config.package_name
@@ -78,8 +121,36 @@ def write_json_config_file(config: PackageScannedInfo, output_path: Path) -> Non
         json.dump(config.model_dump(), f, indent=2, ensure_ascii=False)
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Generate package scanned information"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=f"Always rescan packages instead of reusing results cached in {CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--skip-prefixes",
+        type=lambda value: tuple(filter(None, value.split(","))),
+        default=DEFAULT_SKIP_PREFIXES,
+        help="Comma separated module prefixes excluded from the request_id method scan "
+        f"(default: {','.join(DEFAULT_SKIP_PREFIXES)})",
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        default=DEFAULT_SCAN_WORKERS,
+        help="Number of processes importing modules for the request_id method scan "
+        f"(default: {DEFAULT_SCAN_WORKERS})",
+    )
+    return parser.parse_args()
+
+
 def main():
     """Main function"""
+    args = parse_args()
+
     print("=== Package Configuration Generator ===")
 
     # You can specify multiple packages here
@@ -105,8 +176,21 @@ def main():
     for package_name in package_names:
         print(f"\n--- Processing {package_name} ---")
 
-        # Generate configuration
-        config = generate_package_config(package_name)
+        # Reuse the previous scan if the installed package did not change
+        fingerprint = get_package_fingerprint(
+            package_name, (*args.skip_prefixes, f"ignore_init={IGNORE_INIT}")
+        )
+        config = None if args.no_cache else load_cached_package_config(
+            package_name, fingerprint
+        )
+        if config is not None:
+            print(f"Using cached scan result for {package_name}")
+        else:
+            # Generate configuration
+            config = generate_package_config(
+                package_name, args.skip_prefixes, args.max_workers
+            )
+            save_cached_package_config(config, fingerprint)
         generated_configs.append(config)
 
         package_full_name = normalized_package_full_name(
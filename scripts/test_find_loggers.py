@@ -4,11 +4,12 @@ Test script for find_logger_modules function
 Validates the function output against the generated JSON configuration
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import List
 
+import orjson
+
 # Add the project root to sys.path to allow imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -27,8 +28,7 @@ def load_expected_logger_modules(package_name: str, package_version: str) -> Lis
         return []
 
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = orjson.loads(json_file.read_bytes())
 
         return config.get("modules_with_logger", [])
     except Exception as e:
@@ -44,12 +44,18 @@ def compare_logger_lists(expected: List[str], actual: List[str]) -> None:
     print(f"Expected logger modules count: {len(expected_set)}")
     print(f"Actual logger modules count: {len(actual_set)}")
 
+    if expected_set == actual_set:
+        print(f"Common modules: {len(expected_set)}")
+        print(
+            "\n✅ Perfect match! All logger modules match the expected configuration."
+        )
+        return
+
     # Find differences
     missing_modules = expected_set - actual_set
     extra_modules = actual_set - expected_set
-    common_modules = expected_set & actual_set
 
-    print(f"Common modules: {len(common_modules)}")
+    print(f"Common modules: {len(expected_set) - len(missing_modules)}")
 
     if missing_modules:
         print(f"\nMissing logger modules ({len(missing_modules)}):")
@@ -61,14 +67,9 @@ def compare_logger_lists(expected: List[str], actual: List[str]) -> None:
         for module in sorted(extra_modules):
             print(f"  + {module}")
 
-    if not missing_modules and not extra_modules:
-        print(
-            "\n✅ Perfect match! All logger modules match the expected configuration."
-        )
-    else:
-        print(f"\n⚠️  Found differences:")
-        print(f"   Missing: {len(missing_modules)}")
-        print(f"   Extra: {len(extra_modules)}")
+    print(f"\n⚠️  Found differences:")
+    print(f"   Missing: {len(missing_modules)}")
+    print(f"   Extra: {len(extra_modules)}")
 
 
 def test_find_logger_modules():
@@ -83,7 +84,8 @@ def test_find_logger_modules():
         return False
 
     print("\nStep 2: Scanning vLLM modules for logger instances...")
-    actual_modules = find_logger_modules("vllm")
+    # Only compared as sets below, ordering does not matter
+    actual_modules = find_logger_modules("vllm", sort=False)
 
     print("\nStep 3: Comparing results...")
     compare_logger_lists(expected_modules, actual_modules)
@@ -4,11 +4,12 @@ Test script for find_methods_with_request_id function
 Validates the function output against the generated JSON configuration
 """
 
-import json
 import sys
 from pathlib import Path
 from typing import List
 
+import orjson
+
 # Add the project root to sys.path to allow imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
@@ -27,8 +28,7 @@ def load_expected_methods(package_name: str, package_version: str) -> List[str]:
         return []
 
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = orjson.loads(json_file.read_bytes())
 
         return config.get("methods_with_request_id", [])
     except Exception as e:
@@ -44,12 +44,16 @@ def compare_method_lists(expected: List[str], actual: List[str]) -> None:
     print(f"Expected methods count: {len(expected_set)}")
     print(f"Actual methods count: {len(actual_set)}")
 
+    if expected_set == actual_set:
+        print(f"Common methods: {len(expected_set)}")
+        print("\n✅ Perfect match! All methods match the expected configuration.")
+        return
+
     # Find differences
     missing_methods = expected_set - actual_set
     extra_methods = actual_set - expected_set
-    common_methods = expected_set & actual_set
 
-    print(f"Common methods: {len(common_methods)}")
+    print(f"Common methods: {len(expected_set) - len(missing_methods)}")
 
     if missing_methods:
         print(f"\nMissing methods ({len(missing_methods)}):")
@@ -61,12 +65,9 @@ def compare_method_lists(expected: List[str], actual: List[str]) -> None:
         for method in sorted(extra_methods):
             print(f"  + {method}")
 
-    if not missing_methods and not extra_methods:
-        print("\n✅ Perfect match! All methods match the expected configuration.")
-    else:
-        print(f"\n⚠️  Found differences:")
-        print(f"   Missing: {len(missing_methods)}")
-        print(f"   Extra: {len(extra_methods)}")
+    print(f"\n⚠️  Found differences:")
+    print(f"   Missing: {len(missing_methods)}")
+    print(f"   Extra: {len(extra_methods)}")
 
 
 def test_find_methods_with_request_id():
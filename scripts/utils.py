@@ -1,126 +1,540 @@
+import ast
+import hashlib
 import importlib
-import inspect
+import importlib.metadata
+import importlib.util
 import logging
-import pkgutil
+import os
+import sys
 import warnings
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import (
+    AbstractSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+# `inspect` and `pkgutil` are imported where they are used: only the import-based
+# method scan needs them, and build steps importing this module should not pay for it
 
+
+def fast_rmtree(path: str, max_workers: int = 8) -> None:
+    """Remove a directory tree, unlinking the files of each directory concurrently.
+
+    Deleting large build trees is bound by per-file syscall latency, and `os.unlink`
+    releases the GIL, so a thread pool overlaps the unlinks.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for root, dirs, files in os.walk(path, topdown=False):
+            # consume the iterator to wait for the unlinks and raise their errors
+            list(executor.map(os.unlink, (os.path.join(root, f) for f in files)))
+            for name in dirs:
+                # symlinks to directories are listed in dirs but not walked into
+                dir_path = os.path.join(root, name)
+                if os.path.islink(dir_path):
+                    os.unlink(dir_path)
+            os.rmdir(root)
+
+
+def remove_trees(paths: Iterable[str]) -> None:
+    """Remove several directory trees concurrently"""
+    with ThreadPoolExecutor() as executor:
+        futures = [executor.submit(fast_rmtree, path) for path in paths]
+    for future in futures:
+        future.result()
+
+
+@lru_cache(maxsize=None)
 def get_package_version(package_name: str) -> str:
     """Get package version"""
     try:
-        import importlib.metadata
-
         return importlib.metadata.version(package_name)
     except ImportError:
         print(f"Warning: {package_name} not found, using default version")
         return "unknown"
 
 
+@lru_cache(maxsize=None)
 def normalized_version(version: str) -> str:
     """Normalize version string"""
     return version.replace(".", "_").replace("-", "_").replace("+", "___")
 
 
+@lru_cache(maxsize=None)
 def normalized_package_full_name(package_name: str, package_version: str) -> str:
     return f"{package_name}__v{normalized_version(package_version)}"
 
 
-def find_logger_modules(root_module_name: str) -> List[str]:
-    """Recursively find all modules containing a 'logger' variable of type logging.Logger.
+LOGGER_FACTORY_NAMES = ("init_logger", "getLogger")
+REQUEST_ID_PARAMETER_NAMES = frozenset({"request_id", "req_id"})
+
+# Heavy subpackages without user-facing request_id methods, importing them pulls in
+# torch kernels, flash-attn, device communicators, etc.
+DEFAULT_SKIP_PREFIXES = (
+    "vllm.model_executor.models",
+    "vllm._C",
+    "vllm.attention.ops",
+    "vllm.distributed.device_communicators",
+    "vllm.platforms",
+)
+# Every scan worker imports a large part of the package, memory rather than cores
+# limits how many of them are worth running
+DEFAULT_SCAN_WORKERS = min(os.cpu_count() or 1, 8)
+# Subpackages with these names hold no runtime code and are never descended into,
+# `benchmarks` is not one of them: `vllm.benchmarks` is a runtime package
+EXCLUDED_PACKAGE_NAMES = frozenset({"tests", "test", "_vendor"})
+
+
+def is_skipped_module(module_name: str, skip_prefixes: Sequence[str]) -> bool:
+    """Check if the module is one of the prefixes or a submodule of one of them"""
+    return any(
+        module_name == prefix or module_name.startswith(f"{prefix}.")
+        for prefix in skip_prefixes
+    )
+
+
+def _is_logger_factory_call(node: ast.AST) -> bool:
+    """Check if the node is a call like `init_logger(...)` or `logging.getLogger(...)`"""
+    if not isinstance(node, ast.Call):
+        return False
+    func = node.func
+    if isinstance(func, ast.Name):
+        return func.id in LOGGER_FACTORY_NAMES
+    if isinstance(func, ast.Attribute):
+        return func.attr in LOGGER_FACTORY_NAMES
+    return False
+
+
+def _read_source_file(path: str) -> Tuple[Optional[bytes], Optional[str]]:
+    try:
+        with open(path, "rb") as f:
+            return f.read(), None
+    except OSError as e:
+        return None, f"Error reading source file {path}: {e}"
+
+
+def _body_without_docstring(node: Union[ast.Module, ast.ClassDef]) -> List[ast.stmt]:
+    """Get the statements of a module or class body, leaving out its docstring"""
+    body = node.body
+    if (
+        body
+        and isinstance(body[0], ast.Expr)
+        and isinstance(body[0].value, ast.Constant)
+        and isinstance(body[0].value.value, str)
+    ):
+        return body[1:]
+    return body
+
+
+_TRY_NODES = (ast.Try, ast.TryStar) if hasattr(ast, "TryStar") else (ast.Try,)
+
+
+def _binds_logger_name(node: ast.stmt) -> bool:
+    """Check if an assignment or import statement binds the name 'logger'"""
+    if isinstance(node, ast.Assign):
+        return any(
+            isinstance(target, ast.Name) and target.id == "logger"
+            for target in node.targets
+        )
+    if isinstance(node, ast.AnnAssign):
+        return (
+            node.value is not None
+            and isinstance(node.target, ast.Name)
+            and node.target.id == "logger"
+        )
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return any(
+            (alias.asname or alias.name.partition(".")[0]) == "logger"
+            for alias in node.names
+        )
+    return False
+
+
+def _has_module_logger(tree: ast.Module) -> Optional[bool]:
+    """Check if the module binds a module-level 'logger' from a logger factory call.
+
+    Statements nested in module-level `if`, `try`, `with` and loop blocks count too.
+
+    Returns:
+        True if 'logger' is assigned from a logger factory call, None if it is bound
+        otherwise, e.g. imported from another module, so only importing the module
+        tells whether it is a logger, False if it is not bound at all
+    """
+    ambiguous = False
+    pending = list(_body_without_docstring(tree))
+    while pending:
+        node = pending.pop()
+        if isinstance(node, (ast.If, ast.For, ast.AsyncFor, ast.While)):
+            pending.extend(node.body)
+            pending.extend(node.orelse)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            pending.extend(node.body)
+        elif isinstance(node, _TRY_NODES):
+            pending.extend(node.body)
+            for handler in node.handlers:
+                pending.extend(handler.body)
+            pending.extend(node.orelse)
+            pending.extend(node.finalbody)
+        elif _binds_logger_name(node):
+            value = getattr(node, "value", None)
+            if value is not None and _is_logger_factory_call(value):
+                return True
+            ambiguous = True
+    return None if ambiguous else False
+
+
+def _iter_package_source_files(
+    root_module_name: str,
+    skip_prefixes: Sequence[str] = (),
+    excluded_names: AbstractSet[str] = EXCLUDED_PACKAGE_NAMES,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (module_name, source_path) for every python source file of a package.
+
+    The package is located with `importlib.util.find_spec`, so none of its modules
+    are imported. Only directories containing an `__init__.py` are descended into,
+    matching what `pkgutil.iter_modules` would discover. Subpackages matching
+    `skip_prefixes` or named in `excluded_names` are pruned.
+    """
+    spec = importlib.util.find_spec(root_module_name)
+    if spec is None or not spec.submodule_search_locations:
+        warnings.warn(f"Package {root_module_name} not found")
+        return
+
+    for package_dir in spec.submodule_search_locations:
+        for dirpath, dirnames, filenames in os.walk(package_dir):
+            dirnames[:] = sorted(
+                name
+                for name in dirnames
+                if name.isidentifier()
+                and name not in excluded_names
+                and os.path.isfile(os.path.join(dirpath, name, "__init__.py"))
+            )
+            relative_parts = Path(dirpath).relative_to(package_dir).parts
+            package_name = ".".join((root_module_name, *relative_parts))
+            if is_skipped_module(package_name, skip_prefixes):
+                dirnames.clear()
+                continue
+            for filename in sorted(filenames):
+                stem, ext = os.path.splitext(filename)
+                if ext != ".py" or not stem.isidentifier():
+                    continue
+                module_name = (
+                    package_name if stem == "__init__" else f"{package_name}.{stem}"
+                )
+                if is_skipped_module(module_name, skip_prefixes):
+                    continue
+                yield module_name, os.path.join(dirpath, filename)
+
+
+def _iter_parsed_source_files(
+    root_module_name: str,
+    skip_prefixes: Sequence[str],
+    errors: List[str],
+    excluded_names: AbstractSet[str] = EXCLUDED_PACKAGE_NAMES,
+    required_token: Optional[bytes] = None,
+    max_workers: int = 8,
+) -> Iterator[Tuple[str, ast.Module]]:
+    """Yield (module_name, parsed tree) for every python source file of a package.
+
+    Reading files is I/O bound and done ahead by a thread pool, parsing holds the GIL
+    and stays on the calling thread. Files that can not be read or parsed are
+    reported to `errors` and skipped. With `required_token` set, files not containing
+    it are skipped without being parsed.
+    """
+    source_files = list(
+        _iter_package_source_files(root_module_name, skip_prefixes, excluded_names)
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        contents = executor.map(_read_source_file, [path for _, path in source_files])
+        for (module_name, path), (source, error) in zip(source_files, contents):
+            if source is None:
+                errors.append(error)
+                continue
+            if required_token is not None and required_token not in source:
+                continue
+            try:
+                # Parsing bytes honors PEP 263 encoding declarations
+                tree = ast.parse(source, filename=path, type_comments=False)
+            except (SyntaxError, ValueError) as e:
+                errors.append(f"Error parsing source file {path}: {e}")
+                continue
+            yield module_name, tree
+
+
+def get_package_fingerprint(package_name: str, scan_options: Iterable[str] = ()) -> str:
+    """Fingerprint the installed package by its version and source file mtimes.
+
+    `scan_options` are options changing the scan result, they are mixed into the
+    fingerprint so results scanned with different options are not mixed up. The
+    source of the scanner itself is mixed in as well, so changing the scan rules
+    invalidates results cached by an older scanner.
+    """
+    digest = hashlib.sha256(get_package_version(package_name).encode())
+    digest.update(f"{sorted(scan_options)}\n".encode())
+    digest.update(hashlib.sha256(Path(__file__).read_bytes()).digest())
+    digest.update(f"{sorted(EXCLUDED_PACKAGE_NAMES)}\n".encode())
+    for _, path in _iter_package_source_files(package_name):
+        digest.update(f"{path}:{os.stat(path).st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def find_logger_modules(
+    root_module_name: str,
+    skip_prefixes: Sequence[str] = (),
+    excluded_names: AbstractSet[str] = EXCLUDED_PACKAGE_NAMES,
+    sort: bool = True,
+) -> Sequence[str]:
+    """Recursively find all modules containing a module-level 'logger' variable.
+
+    Source files are parsed with `ast` instead of being imported, so scanning does not
+    pay for importing the package and its heavy runtime dependencies (torch, CUDA, ...).
+    Only modules binding 'logger' other than from a logger factory call, e.g. by
+    importing it, are imported to check the type of their 'logger'.
 
     Args:
         root_module_name: The root module name to start traversing from
+        skip_prefixes: module prefixes whose subtrees are not scanned
+        excluded_names: names of subpackages which are not scanned wherever they are
+        sort: whether to sort the result, callers which only test membership can
+            skip it
 
     Returns:
-        List of module names containing logger variables
+        Module names containing logger variables, in no particular order unless
+        `sort` is set
     """
-
-    def _traverse_module(module_name: str, found_modules: List[str]) -> None:
-        try:
-            module = importlib.import_module(module_name)
-
-            # Check for logger in current module's attributes
-            for name, obj in inspect.getmembers(
-                module, lambda x: isinstance(x, logging.Logger)
-            ):
-                if name == "logger":
-                    found_modules.append(module_name)
-                    break
-
-            # Traverse submodules
-            if hasattr(module, "__path__"):
-                for _, name, is_pkg in pkgutil.iter_modules(module.__path__):
-                    submodule_name = f"{module_name}.{name}"
-                    _traverse_module(submodule_name, found_modules)
-
-        except Exception as e:
-            warnings.warn(f"Error traversing module {module_name}: {e}")
-
-    modules_with_logger = []
-    _traverse_module(root_module_name, modules_with_logger)
+    modules_with_logger: Set[str] = set()
+    # Modules binding 'logger' other than from a logger factory call
+    ambiguous_modules: List[str] = []
+    errors: List[str] = []
+    for module_name, tree in _iter_parsed_source_files(
+        root_module_name,
+        skip_prefixes,
+        errors,
+        excluded_names,
+        # Sources not mentioning 'logger' at all can not assign it
+        required_token=b"logger",
+    ):
+        has_module_logger = _has_module_logger(tree)
+        if has_module_logger:
+            modules_with_logger.add(module_name)
+        elif has_module_logger is None:
+            ambiguous_modules.append(module_name)
+    # Only importing tells whether an imported or computed 'logger' is a logger
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for module_name in ambiguous_modules:
+            try:
+                module = _import_module(module_name)
+            except Exception as e:
+                errors.append(f"Error traversing module {module_name}: {e}")
+                continue
+            if isinstance(vars(module).get("logger"), logging.Logger):
+                modules_with_logger.add(module_name)
+    _report_scan_errors(errors)
+    if not sort:
+        return tuple(modules_with_logger)
     return sorted(modules_with_logger)
 
 
+@lru_cache(maxsize=None)
+def _function_has_request_id_parameter(func) -> bool:
+    """Check if the function signature contains 'request_id' or 'req_id' parameter"""
+    import inspect
+
+    try:
+        signature = inspect.signature(func)
+    except (ValueError, TypeError):
+        return False
+    return not REQUEST_ID_PARAMETER_NAMES.isdisjoint(signature.parameters)
+
+
+def _has_request_id_parameter(method) -> bool:
+    """Check if the method contains 'request_id' or 'req_id' parameter"""
+    # Bound methods are created on every attribute access, cache on the function
+    func = getattr(method, "__func__", method)
+    try:
+        return _function_has_request_id_parameter(func)
+    except TypeError:
+        # unhashable callable objects
+        return _function_has_request_id_parameter.__wrapped__(func)
+
+
+def _import_module(module_name: str):
+    """Import a module, skipping the import machinery if it is already imported"""
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    return module
+
+
+def _report_scan_errors(errors: List[str]) -> None:
+    """Print errors collected during a scan at once instead of warning per module"""
+    if errors:
+        sys.stderr.write("".join(f"Warning: {error}\n" for error in errors))
+
+
+def _is_extension_module(module_finder, module_name: str) -> bool:
+    """Check if a module found by `pkgutil` is a compiled extension module"""
+    from importlib.machinery import EXTENSION_SUFFIXES
+
+    find_spec = getattr(module_finder, "find_spec", None)
+    if find_spec is None:
+        return False
+    # File finders cache their directory listing, so this does not touch the disk
+    spec = find_spec(module_name)
+    origin = spec.origin if spec is not None else None
+    return origin is not None and origin.endswith(tuple(EXTENSION_SUFFIXES))
+
+
+def _enumerate_submodules(
+    root_module_name: str,
+    skip_prefixes: Sequence[str],
+    errors: List[str],
+    excluded_names: AbstractSet[str] = EXCLUDED_PACKAGE_NAMES,
+) -> List[str]:
+    """List the root module and all of its submodules, importing only packages.
+
+    Modules inside packages named in `excluded_names` are left out, like in the
+    source scans. Compiled extension modules are left out, importing them is
+    expensive and the classes they define are not python functions with
+    inspectable parameters.
+    """
+    import pkgutil
+
+    def onerror(package_name: str) -> None:
+        # walk_packages imports skipped packages too, their failures do not matter
+        if not is_skipped_module(package_name, skip_prefixes):
+            errors.append(f"Error traversing package {package_name}")
+
+    root_module = _import_module(root_module_name)
+    module_names = [root_module_name]
+    if hasattr(root_module, "__path__"):
+        for module_finder, module_name, is_package in pkgutil.walk_packages(
+            root_module.__path__, prefix=f"{root_module_name}.", onerror=onerror
+        ):
+            if is_skipped_module(module_name, skip_prefixes):
+                continue
+            package_names = module_name[len(root_module_name) + 1 :].split(".")
+            if not is_package:
+                package_names.pop()
+            if not excluded_names.isdisjoint(package_names):
+                continue
+            if not is_package and _is_extension_module(module_finder, module_name):
+                continue
+            module_names.append(module_name)
+    return module_names
+
+
+def _scan_one_module(
+    module_name: str, ignore_init: bool = True
+) -> Tuple[Set[str], Optional[str]]:
+    """Find methods with 'request_id' or 'req_id' parameter of classes defined in one module
+
+    Inherited methods are reported for every subclass too, each class is traced
+    through its own attribute.
+
+    Returns:
+        (found methods, import error message or None) tuple
+    """
+    import inspect
+
+    found_methods: Set[str] = set()
+    try:
+        module = _import_module(module_name)
+    except Exception as e:
+        # Importing third-party modules may fail in many environment specific ways,
+        # only the inspection below is expected to never fail
+        return found_methods, f"Error traversing module {module_name}: {e}"
+
+    # Check all classes in the current module, reading the module namespace directly
+    # instead of sorting and re-fetching every attribute like inspect.getmembers
+    for class_name, class_obj in list(vars(module).items()):
+        # Only check classes defined in the current module (avoid imported classes)
+        if not (isinstance(class_obj, type) and class_obj.__module__ == module_name):
+            continue
+        # Walk the class dicts along the MRO, `__dict__` avoids the descriptor
+        # execution of inspect.getmembers, names seen first shadow their bases
+        seen_names: Set[str] = set()
+        for owner in class_obj.__mro__:
+            if owner is object:
+                continue
+            for method_name, method_obj in owner.__dict__.items():
+                if method_name in seen_names:
+                    continue
+                seen_names.add(method_name)
+                if isinstance(method_obj, (classmethod, staticmethod)):
+                    method_obj = method_obj.__func__
+                # Skip C-implemented builtins, they never take a request id
+                if inspect.isbuiltin(method_obj):
+                    continue
+
+                # Check if it's a function, method, or other callable
+                if callable(method_obj) and _has_request_id_parameter(method_obj):
+                    # Skip __init__ if ignore_init is True
+                    if ignore_init and method_name == "__init__":
+                        continue
+
+                    found_methods.add(f"{module_name}.{class_name}:{method_name}")
+
+    return found_methods, None
+
+
+def _init_scan_worker() -> None:
+    # Imports of heavy packages emit lots of warnings, which are useless in workers
+    warnings.filterwarnings("ignore")
+
+
 def find_methods_with_request_id(
-    root_module_name: str = "vllm", ignore_init: bool = True
+    root_module_name: str = "vllm",
+    ignore_init: bool = True,
+    skip_prefixes: Sequence[str] = DEFAULT_SKIP_PREFIXES,
+    max_workers: int = DEFAULT_SCAN_WORKERS,
 ) -> List[str]:
     """Recursively find all methods containing a 'request_id' or 'req_id' parameter.
 
+    Submodules are scanned in parallel by a process pool, since importing and
+    inspecting thousands of modules is GIL-bound.
+
     Args:
         root_module_name: root module name
         ignore_init: whether to ignore methods with __init__ name
+        skip_prefixes: module prefixes whose subtrees are excluded from the scan
+        max_workers: number of scan worker processes
 
     Returns:
         List of method names with 'request_id' or 'req_id' parameter
     """
-
-    def _has_request_id_parameter(method) -> bool:
-        """Check if the method contains 'request_id' or 'req_id' parameter"""
-        try:
-            signature = inspect.signature(method)
-            parameter_names = list(signature.parameters.keys())
-            return any(
-                param_name in ["request_id", "req_id"] for param_name in parameter_names
+    errors: List[str] = []
+    try:
+        # Warnings raised while importing packages are noise for the scan
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            module_names = _enumerate_submodules(
+                root_module_name, skip_prefixes, errors
             )
-        except (ValueError, TypeError):
-            return False
-
-    def _traverse_module_for_methods(
-        module_name: str, found_methods: List[str]
-    ) -> None:
-        try:
-            module = importlib.import_module(module_name)
-
-            # Check all classes in the current module
-            for class_name, class_obj in inspect.getmembers(module, inspect.isclass):
-                # Only check classes defined in the current module (avoid imported classes)
-                if class_obj.__module__ == module_name:
-                    # Check all methods in the class using inspect.getmembers with a custom predicate
-                    for method_name, method_obj in inspect.getmembers(class_obj):
-                        # Check if it's a function, method, or other callable
-                        if callable(method_obj) and _has_request_id_parameter(
-                            method_obj
-                        ):
-                            # Skip __init__ if ignore_init is True
-                            if ignore_init and method_name == "__init__":
-                                continue
-
-                            method_full_name = (
-                                f"{module_name}.{class_name}:{method_name}"
-                            )
-                            if method_full_name not in found_methods:
-                                found_methods.append(method_full_name)
-
-            # Traverse submodules
-            if hasattr(module, "__path__"):
-                for _, submodule_name, is_pkg in pkgutil.iter_modules(module.__path__):
-                    full_submodule_name = f"{module_name}.{submodule_name}"
-                    _traverse_module_for_methods(full_submodule_name, found_methods)
-
-        except Exception as e:
-            warnings.warn(f"Error traversing module {module_name}: {e}")
-
-    methods_with_request_id = []
-    _traverse_module_for_methods(root_module_name, methods_with_request_id)
+    except (ImportError, OSError) as e:
+        _report_scan_errors([f"Error traversing module {root_module_name}: {e}"])
+        return []
+
+    methods_with_request_id: Set[str] = set()
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_scan_worker
+    ) as executor:
+        for found_methods, error in executor.map(
+            partial(_scan_one_module, ignore_init=ignore_init),
+            module_names,
+            chunksize=32,
+        ):
+            methods_with_request_id.update(found_methods)
+            if error is not None:
+                errors.append(error)
+    _report_scan_errors(errors)
     return sorted(methods_with_request_id)
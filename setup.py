@@ -4,7 +4,6 @@ from distutils.command.clean import clean
 import os
 import subprocess
 import sys
-import shutil
 
 ROOT_DIR = os.path.dirname(__file__)
 VERSION = "0.1.0"
@@ -24,15 +23,28 @@ def read_readme() -> str:
         return ""
 
 
+def should_regenerate_scanned_info() -> bool:
+    """Scanned info is vendored in the repo, regenerate it only on request"""
+    return os.getenv("VLLM_PLUGIN_REGENERATE", "False").lower() in ("true", "1")
+
+
 class CustomBuildPy(build_py):
-    """Custom build command that generates configuration files before building"""
+    """Custom build command that optionally regenerates configuration files before building"""
 
     def run(self):
-        """Run configuration generation before building"""
+        """Run configuration generation before building if requested"""
+        if not should_regenerate_scanned_info():
+            print(
+                "Using vendored package scanned info, "
+                "set VLLM_PLUGIN_REGENERATE=1 to regenerate it"
+            )
+            super().run()
+            return
+
         print("Generating vLLM scanned info...")
 
         # Run configuration generation script
-        generate_script = get_path("scripts", "generate_config.py")
+        generate_script = get_path("scripts", "generate_package_scanned_info.py")
         if os.path.exists(generate_script):
             try:
                 subprocess.run(
@@ -59,21 +71,19 @@ class CustomClean(clean):
         # Call the parent clean command first
         super().run()
 
-        # Remove egg_info directory
-        egg_info_dirs = [
+        # Imported lazily, `scripts` is only importable when running from the source tree
+        from scripts.utils import remove_trees
+
+        # Remove egg_info directory and build directory if they exist
+        dirs_to_remove = [
             "src/vllm_kubernetes_plugin.egg-info",
             "vllm_kubernetes_plugin.egg-info",
+            get_path("build"),
         ]
-        for egg_info_dir in egg_info_dirs:
-            if os.path.exists(egg_info_dir):
-                print(f"Removing {egg_info_dir}")
-                shutil.rmtree(egg_info_dir)
-
-        # Remove build directory if it exists
-        build_dir = get_path("build")
-        if os.path.exists(build_dir):
-            print(f"Removing {build_dir}")
-            shutil.rmtree(build_dir)
+        dirs_to_remove = [path for path in dirs_to_remove if os.path.exists(path)]
+        for path in dirs_to_remove:
+            print(f"Removing {path}")
+        remove_trees(dirs_to_remove)
 
         print("Clean completed")
 
@@ -2,16 +2,29 @@
 vllm logger plugin for kubernetes deployment
 """
 
-import importlib
+import atexit
+import functools
 import logging
 import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
 import warnings
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import vllm.envs as envs
 from vllm_kubernetes_plugin.utils import get_package_scanned_info_module
 
 _log_folder_created = False
+_all_loggers_patched = False
+_ENV_CACHE: Dict[str, Any] = {}
+# `VLLM_LOG_FORMAT` with `{app_name}` already substituted
+_resolved_log_format: Optional[str] = None
+_shared_handlers: Optional[Tuple[List[logging.Handler], Union[int, str]]] = None
+_queue_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional["FileQueueHandler"] = None
 
 DEFAULT_APP_NAME = "standalone"
 DEFAULT_LOG_ROOT_MODULES = "vllm,lmcache"
@@ -20,29 +33,59 @@ DEFAULT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
 DEFAULT_LOG_FILENAME = "api_server.log"
 DEFAULT_LOG_FILE_MAX_BYTES = "8388608"
 DEFAULT_LOG_FILE_BACKUP_COUNT = "5"
+LOG_FILE_BUFFER_SIZE = 64 * 1024
+LOG_FILE_FLUSH_INTERVAL = 5.0
+
+
+def _cached_env(
+    name: str, default: str, cast: Callable[[str], Any] = str
+) -> Callable[[], Any]:
+    """Make a `vllm.envs` getter that reads the environment variable only once"""
+
+    def getter() -> Any:
+        if name not in _ENV_CACHE:
+            _ENV_CACHE[name] = cast(os.getenv(name, default))
+        return _ENV_CACHE[name]
+
+    return getter
+
+
+def _resolve_log_format() -> str:
+    global _resolved_log_format
+
+    if _resolved_log_format is None:
+        fmt = envs.VLLM_LOG_FORMAT
+        if "{app_name}" in fmt:
+            fmt = fmt.format(app_name=envs.APP_NAME)
+        _resolved_log_format = fmt
+    return _resolved_log_format
 
 
 def add_logger_env_vars() -> None:
-    """Setup additional environment variables for vLLM logger plugin"""
+    """Setup additional environment variables for vLLM logger plugin
+
+    The environment is read once on first access, (re)adding the variables drops
+    previously read values.
+    """
+    global _resolved_log_format
+
+    _ENV_CACHE.clear()
+    _resolved_log_format = None
     additional_env_vars = {
         # kubernetes application name
-        "APP_NAME": lambda: os.getenv("APP_NAME", DEFAULT_APP_NAME),
+        "APP_NAME": _cached_env("APP_NAME", DEFAULT_APP_NAME),
         # root module list for log module scanning
-        "LOG_ROOT_MODULES": lambda: os.getenv(
-            "LOG_ROOT_MODULES", DEFAULT_LOG_ROOT_MODULES
-        ),
-        "VLLM_LOG_FORMAT": lambda: os.getenv("VLLM_LOG_FORMAT", DEFAULT_LOG_FORMAT),
-        "VLLM_LOG_DATE_FORMAT": lambda: os.getenv(
+        "LOG_ROOT_MODULES": _cached_env("LOG_ROOT_MODULES", DEFAULT_LOG_ROOT_MODULES),
+        "VLLM_LOG_FORMAT": _cached_env("VLLM_LOG_FORMAT", DEFAULT_LOG_FORMAT),
+        "VLLM_LOG_DATE_FORMAT": _cached_env(
             "VLLM_LOG_DATE_FORMAT", DEFAULT_DATE_FORMAT
         ),
-        "VLLM_LOG_FILENAME": lambda: os.getenv(
-            "VLLM_LOG_FILENAME", DEFAULT_LOG_FILENAME
-        ),
-        "VLLM_LOG_FILE_MAX_BYTES": lambda: int(
-            os.getenv("VLLM_LOG_FILE_MAX_BYTES", DEFAULT_LOG_FILE_MAX_BYTES)
+        "VLLM_LOG_FILENAME": _cached_env("VLLM_LOG_FILENAME", DEFAULT_LOG_FILENAME),
+        "VLLM_LOG_FILE_MAX_BYTES": _cached_env(
+            "VLLM_LOG_FILE_MAX_BYTES", DEFAULT_LOG_FILE_MAX_BYTES, int
         ),
-        "VLLM_LOG_FILE_BACKUP_COUNT": lambda: int(
-            os.getenv("VLLM_LOG_FILE_BACKUP_COUNT", DEFAULT_LOG_FILE_BACKUP_COUNT)
+        "VLLM_LOG_FILE_BACKUP_COUNT": _cached_env(
+            "VLLM_LOG_FILE_BACKUP_COUNT", DEFAULT_LOG_FILE_BACKUP_COUNT, int
         ),
     }
 
@@ -56,6 +99,7 @@ def make_stream_handler() -> logging.StreamHandler:
     return logging.StreamHandler()
 
 
+@functools.lru_cache(maxsize=1)
 def default_log_folder() -> str:
     if os.path.exists("/workspace"):
         return "/workspace/logs"
@@ -81,8 +125,119 @@ def get_log_file_name() -> str:
     return f"{default_log_folder()}/{envs.VLLM_LOG_FILENAME}"
 
 
-def make_file_handler() -> logging.handlers.RotatingFileHandler:
-    return logging.handlers.RotatingFileHandler(
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler collecting records in a write buffer.
+
+    The buffer is written out once it holds `buffer_size` characters, for records
+    of level ERROR and above, or once `flush_interval` seconds have passed, a
+    daemon thread flushes idle buffers. The file size is tracked while writing,
+    since `tell()` on a text stream would flush on every record.
+
+    The buffer is kept by the handler instead of the stream, so a forked child can
+    drop the records inherited from its parent, which are written by the parent.
+    Forked children write every record right away: vLLM's forked processes exit
+    through `os._exit`, which skips the exit hooks that would flush the buffer.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        maxBytes: int = 0,
+        backupCount: int = 0,
+        encoding: Optional[str] = None,
+        buffer_size: int = LOG_FILE_BUFFER_SIZE,
+        flush_interval: float = LOG_FILE_FLUSH_INTERVAL,
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self._pending: List[str] = []
+        self._pending_size = 0
+        self._stream_size = 0
+        self._last_flush = time.monotonic()
+        self._flush_stopped = threading.Event()
+        super().__init__(
+            filename, maxBytes=maxBytes, backupCount=backupCount, encoding=encoding
+        )
+        self._start_flush_thread()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(before=self.flush, after_in_child=self._reset_in_child)
+
+    def _open(self):
+        stream = super()._open()
+        self._stream_size = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def _start_flush_thread(self) -> None:
+        if self._flush_stopped.is_set():
+            return
+        threading.Thread(
+            target=self._flush_periodically,
+            name="vllm-log-file-flush",
+            daemon=True,
+        ).start()
+
+    def _flush_periodically(self) -> None:
+        while not self._flush_stopped.wait(self.flush_interval):
+            self.flush()
+
+    def _reset_in_child(self) -> None:
+        # Records buffered before `fork()` are written by the parent
+        self._pending = []
+        self._pending_size = 0
+        self._last_flush = time.monotonic()
+        self.buffer_size = 0
+
+    def _write_pending(self) -> None:
+        if not self._pending:
+            return
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.write("".join(self._pending))
+        self.stream.flush()
+        self._pending = []
+        self._pending_size = 0
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if (
+                self.maxBytes > 0
+                and self._stream_size > 0
+                and self._stream_size + len(msg) >= self.maxBytes
+            ):
+                self._write_pending()
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self._pending.append(msg)
+            self._pending_size += len(msg)
+            self._stream_size += len(msg)
+            if (
+                record.levelno >= logging.ERROR
+                or self._pending_size >= self.buffer_size
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            self._write_pending()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self._flush_stopped.set()
+        super().close()
+
+
+def make_file_handler() -> BufferedRotatingFileHandler:
+    return BufferedRotatingFileHandler(
         filename=get_log_file_name(),
         maxBytes=envs.VLLM_LOG_FILE_MAX_BYTES,
         backupCount=envs.VLLM_LOG_FILE_BACKUP_COUNT,
@@ -90,47 +245,232 @@ def make_file_handler() -> logging.handlers.RotatingFileHandler:
     )
 
 
+def _stop_queue_listener() -> None:
+    global _queue_listener
+
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
+def _drain_queue_listener_before_fork() -> None:
+    # Write out queued records before `fork()`, the child would write them again
+    if _queue_listener is not None and _queue_listener._thread is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.flush()
+
+
+def _restart_queue_listener_in_parent() -> None:
+    if _queue_listener is not None and _queue_listener._thread is None:
+        _queue_listener.start()
+
+
+def _log_synchronously_in_child() -> None:
+    global _queue_listener
+
+    # Records enqueued by other parent threads while forking are the parent's to
+    # write. The listener thread does not survive `fork()` and is not restarted,
+    # forked processes exit through `os._exit` without draining the queue.
+    if _queue_listener is not None:
+        try:
+            while True:
+                _queue_listener.queue.get_nowait()
+        except queue.Empty:
+            pass
+        _queue_listener = None
+    if _queue_handler is not None:
+        _queue_handler.synchronous = True
+
+
+class FileQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler handing records to `target` on a listener thread.
+
+    Records of level ERROR and above are handled right away on the logging thread,
+    so they are written even if the process dies before the listener gets to
+    them, and so is every record once `synchronous` is set.
+    """
+
+    def __init__(
+        self, log_queue: "queue.SimpleQueue[logging.LogRecord]", target: logging.Handler
+    ):
+        super().__init__(log_queue)
+        self.target = target
+        self.synchronous = False
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.synchronous or record.levelno >= logging.ERROR:
+            if record.levelno >= self.target.level:
+                self.target.handle(record)
+        else:
+            super().emit(record)
+
+
+def make_queue_handler(target: logging.Handler) -> FileQueueHandler:
+    """Move writes to `target` onto a background listener thread.
+
+    `QueueHandler.prepare` merges msg and args, and any traceback, into the record
+    on the logging thread. The queue handler is left without a formatter, the
+    layout of `target` is applied on the listener thread.
+    """
+    global _queue_listener, _queue_handler
+
+    _stop_queue_listener()
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue, target, respect_handler_level=True
+    )
+    _queue_listener.start()
+    _queue_handler = FileQueueHandler(log_queue, target)
+    return _queue_handler
+
+
+atexit.register(_stop_queue_listener)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_drain_queue_listener_before_fork,
+        after_in_parent=_restart_queue_listener_in_parent,
+        after_in_child=_log_synchronously_in_child,
+    )
+
+
 def make_kubernetes_formatter() -> logging.Formatter:
-    fmt = envs.VLLM_LOG_FORMAT
-    if "{app_name}" in fmt:
-        fmt = fmt.format(app_name=envs.APP_NAME)
+    fmt = _resolve_log_format()
     datefmt = envs.VLLM_LOG_DATE_FORMAT
     return logging.Formatter(fmt=fmt, datefmt=datefmt)
 
 
-def reset_logger_config(logger: logging.Logger) -> None:
+def _build_shared_handlers() -> Tuple[List[logging.Handler], Union[int, str]]:
+    """Build the handlers shared by all patched loggers, only once per process.
+
+    Sharing them avoids opening the log file once per logger and lets every logger
+    rotate the same file under one handler lock. The file is written from a queue
+    listener thread so callers never block on file I/O.
+    """
+    global _shared_handlers
+
+    if _shared_handlers is None:
+        formatter = make_kubernetes_formatter()
+        log_level = envs.VLLM_LOGGING_LEVEL
+        stream_handler = make_stream_handler()
+        file_handler = make_file_handler()
+        for handler in (stream_handler, file_handler):
+            handler.setFormatter(formatter)
+            handler.setLevel(log_level)
+        queue_handler = make_queue_handler(file_handler)
+        queue_handler.setLevel(log_level)
+        _shared_handlers = ([stream_handler, queue_handler], log_level)
+    return _shared_handlers
+
+
+def _attach_shared_handlers(
+    logger: logging.Logger, handlers: List[logging.Handler], log_level: Union[int, str]
+) -> None:
     logger.handlers.clear()
 
     logger.propagate = False
 
-    stream = make_stream_handler()
-    file = make_file_handler()
-    handlers = [stream, file]
-
-    formatter = make_kubernetes_formatter()
-    log_level = envs.VLLM_LOGGING_LEVEL
-
     for handler in handlers:
-        handler.setFormatter(formatter)
-        handler.setLevel(log_level)
         logger.addHandler(handler)
 
     logger.setLevel(log_level)
 
 
-def safe_import_logger(module_name: str) -> logging.Logger:
-    try:
-        module = importlib.import_module(module_name)
-        if hasattr(module, "logger"):
-            return module.logger
+def reset_logger_config(logger: logging.Logger) -> None:
+    handlers, log_level = _build_shared_handlers()
+    if logger.handlers == handlers and not logger.propagate:
+        return
+    _attach_shared_handlers(logger, handlers, log_level)
+
+
+class _ModuleLoggerConfigFinder:
+    """Meta path finder configuring the logger of scanned modules once they are run.
+
+    Loggers of modules not imported yet are configured by module name in advance,
+    which misses loggers created with another name, and logger factories setting
+    their own level or handlers when the module is imported. Configuring the
+    module's `logger` again right after the module is executed has the same result
+    as importing the module before configuring it, without importing it early.
+    """
+
+    def __init__(
+        self,
+        module_names: List[str],
+        handlers: List[logging.Handler],
+        log_level: Union[int, str],
+    ):
+        self._module_names = set(module_names)
+        self._handlers = handlers
+        self._log_level = log_level
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in self._module_names:
+            return None
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
         else:
-            return logging.getLogger(module_name)
-    except Exception as e:
-        warnings.warn(f"Failed to import logger module {module_name}: {e}")
-        return logging.getLogger(module_name)
+            return None
+        loader = spec.loader
+        # Wrap the loader instance instead of replacing it, so the module keeps
+        # its real loader for tracebacks, resources and `isinstance` checks
+        if loader is None or isinstance(loader, type) or not hasattr(
+            loader, "exec_module"
+        ):
+            return spec
+        exec_module = loader.exec_module
+
+        def exec_module_and_configure_logger(module) -> None:
+            try:
+                exec_module(module)
+            finally:
+                vars(loader).pop("exec_module", None)
+            self._module_names.discard(module.__name__)
+            logger = vars(module).get("logger")
+            if isinstance(logger, logging.Logger):
+                _attach_shared_handlers(logger, self._handlers, self._log_level)
+
+        try:
+            loader.exec_module = exec_module_and_configure_logger
+        except AttributeError:
+            # loaders without an instance `__dict__`
+            pass
+        return spec
+
+
+def safe_import_logger(module_name: str) -> logging.Logger:
+    # Do not import modules just to find their logger, most scanned modules are not
+    # loaded yet at registration time. Modules mostly create their logger with
+    # `logging.getLogger(__name__)`, so configuring the logger of that name now is
+    # picked up once the module is imported, `_ModuleLoggerConfigFinder` covers
+    # the others.
+    module = sys.modules.get(module_name)
+    if module is not None:
+        # Read the module namespace directly, `getattr` would trigger lazy
+        # module-level `__getattr__` hooks which may import heavy dependencies
+        logger = vars(module).get("logger")
+        if isinstance(logger, logging.Logger):
+            return logger
+    return logging.getLogger(module_name)
 
 
 def patch_all_loggers():
+    global _all_loggers_patched
+
+    # Registering the plugin more than once must not walk and re-patch every
+    # module logger again
+    if _all_loggers_patched:
+        return
+    _all_loggers_patched = True
+
+    handlers, log_level = _build_shared_handlers()
+    # Scanned modules not imported yet, their loggers are configured again on import
+    pending_modules: List[str] = []
+
     root_modules = envs.LOG_ROOT_MODULES
     root_modules = root_modules.split(",")
     for root_module in root_modules:
@@ -143,7 +483,14 @@ def patch_all_loggers():
         )
         for module_with_logger in modules_with_logger:
             logger = safe_import_logger(module_with_logger)
-            reset_logger_config(logger)
+            _attach_shared_handlers(logger, handlers, log_level)
+            if module_with_logger not in sys.modules:
+                pending_modules.append(module_with_logger)
+
+    if pending_modules:
+        sys.meta_path.insert(
+            0, _ModuleLoggerConfigFinder(pending_modules, handlers, log_level)
+        )
 
 
 def register_logger_plugin():
@@ -4,6 +4,7 @@ from vllm.sequence import SequenceStatus, SequenceGroup, Sequence
 from vllm.v1.core.kv_cache_manager import KVCacheManager, KVCacheBlocks
 from vllm.v1.request import Request, RequestStatus
 import logging
+from operator import attrgetter
 from typing import Optional
 
 from .common.logger_plugin import reset_logger_config
@@ -14,32 +15,44 @@ __all__ = ["patch_v0_allocate", "patch_v0_free", "patch_v1_allocate_slots", "pat
 logger = logging.getLogger(__name__)
 reset_logger_config(logger)
 
+_get_block_id = attrgetter("block_id")
+# Bound once, these run on every KV cache allocate and free
+_INFO = logging.INFO
+_log_enabled = logger.isEnabledFor
+_log_info = logger.info
+
 
 def log_v0_allocate_result(self: SelfAttnBlockSpaceManager, seq_group: SequenceGroup) -> None:
+    if not _log_enabled(_INFO):
+        return
+
     request_id = seq_group.request_id
 
     waiting_seqs = seq_group.get_seqs(status=SequenceStatus.WAITING)
     for seq in waiting_seqs:
         block_table = self.block_tables.get(seq.seq_id)
         if block_table:
-            block_ids = [block.block_id for block in block_table._blocks]
-            logger.info(f"[request_id={request_id}] allocated block for seq_id: {seq.seq_id} with block ids: {block_ids}")
+            block_ids = list(map(_get_block_id, block_table._blocks))
+            _log_info("[request_id=%s] allocated block for seq_id: %s with block ids: %s", request_id, seq.seq_id, block_ids)
 
     if seq_group.is_encoder_decoder():
         encoder_seq = seq_group.get_encoder_seq()
         if encoder_seq:
             block_table = self.block_tables.get(encoder_seq.seq_id)
             if block_table:
-                block_ids = [block.block_id for block in block_table._blocks]
-                logger.info(f"[request_id={request_id}] allocated block for encoder_seq_id: {encoder_seq.seq_id} with block ids: {block_ids}")
+                block_ids = list(map(_get_block_id, block_table._blocks))
+                _log_info("[request_id=%s] allocated block for encoder_seq_id: %s with block ids: %s", request_id, encoder_seq.seq_id, block_ids)
 
 
 def log_v0_free_result(self: SelfAttnBlockSpaceManager, seq: Sequence) -> None:
+    if not _log_enabled(_INFO):
+        return
+
     seq_id = seq.seq_id
     block_table = self.block_tables.get(seq.seq_id)
     if block_table:
-        block_ids = [block.block_id for block in block_table._blocks]
-        logger.info(f"freed block for seq_id={seq_id} with block ids: {block_ids}")
+        block_ids = list(map(_get_block_id, block_table._blocks))
+        _log_info("freed block for seq_id=%s with block ids: %s", seq_id, block_ids)
 
 
 def patch_v0_allocate() -> None:
@@ -63,15 +76,18 @@ def patch_v0_free() -> None:
 
 
 def log_v1_allocate_slots_result(self: KVCacheManager, request: Request, result: Optional[KVCacheBlocks]) -> None:
-    if result:
+    if result and _log_enabled(_INFO):
         block_ids = result.get_block_ids()
-        logger.info(f"[request_id={request.request_id}] allocated block with block ids: {block_ids}")
+        _log_info("[request_id=%s] allocated block with block ids: %s", request.request_id, block_ids)
 
 
 
 def log_v1_free_result(self: KVCacheManager, request: Request) -> None:
+    if not _log_enabled(_INFO):
+        return
+
     block_ids = self.get_block_ids(request.request_id)
-    logger.info(f"[request_id={request.request_id}] freed block with block ids: {block_ids}")
+    _log_info("[request_id=%s] freed block with block ids: %s", request.request_id, block_ids)
 
 
 def patch_v1_allocate_slots() -> None:
@@ -1,19 +1,50 @@
 import json
+import logging
+import time
 import warnings
 from typing import Optional
 
-import pydantic
 import vllm.envs as envs
 from fastapi import FastAPI, Request
-from starlette.concurrency import iterate_in_threadpool
 from vllm.entrypoints.openai.api_server import logger
 from vllm.entrypoints.openai.protocol import ChatCompletionRequest, CompletionRequest
 from vllm.entrypoints.openai.serving_chat import OpenAIServingChat
 from vllm.entrypoints.openai.serving_completion import OpenAIServingCompletion
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import os
 
-__all__ = ["log_response", "register_log_request_response_plugin"]
+try:
+    # orjson is optional, it encodes and decodes the logged payloads several times faster
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps_indented(data) -> str:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+
+else:
+    _json_loads = json.loads
+
+    def _json_dumps_indented(data) -> str:
+        return json.dumps(data, ensure_ascii=False, indent=2)
+
+__all__ = ["LogResponseMiddleware", "log_response", "register_log_request_response_plugin"]
+
+_COMPLETION_PATHS = frozenset(("/v1/chat/completions", "/v1/completions"))
+_MEDIA_CONTENT_TYPES = frozenset(("audio_url", "image_url", "video_url"))
+_SSE_MEDIA_TYPE = b"text/event-stream"
+_SSE_DATA_PREFIX = b"data: "
+_SSE_DATA_PREFIX_LEN = len(_SSE_DATA_PREFIX)
+# Non-streaming response bodies are logged up to this size
+_MAX_LOGGED_BODY_BYTES = 64 * 1024
+# Minimum seconds between two progress lines of the same streaming response
+_STREAMING_PROGRESS_LOG_INTERVAL = 1.0
 
 
 def add_log_request_response_env_vars() -> None:
@@ -28,67 +59,52 @@ def add_log_request_response_env_vars() -> None:
 
 def _extract_content_from_chunk(chunk_data: dict) -> str:
     """Extract content from a streaming response chunk."""
-    try:
-        from vllm.entrypoints.openai.protocol import (
-            ChatCompletionStreamResponse,
-            CompletionStreamResponse,
-        )
-
-        # Try using Completion types for type-safe parsing
-        if chunk_data.get("object") == "chat.completion.chunk":
-            chat_response = ChatCompletionStreamResponse.model_validate(chunk_data)
-            if chat_response.choices and chat_response.choices[0].delta.content:
-                return chat_response.choices[0].delta.content
-        elif chunk_data.get("object") == "text_completion":
-            completion_response = CompletionStreamResponse.model_validate(chunk_data)
-            if completion_response.choices and completion_response.choices[0].text:
-                return completion_response.choices[0].text
-    except pydantic.ValidationError:
-        # Fallback to manual parsing
-        if "choices" in chunk_data and chunk_data["choices"]:
-            choice = chunk_data["choices"][0]
-            if "delta" in choice and choice["delta"].get("content"):
-                return choice["delta"]["content"]
-            elif choice.get("text"):
-                return choice["text"]
-    return ""
+    # Plain dict access, validating every chunk against the response models is
+    # far more expensive than the lookup itself
+    choices = chunk_data.get("choices")
+    if not choices:
+        return ""
+    choice = choices[0]
+    delta = choice.get("delta")
+    return (delta and delta.get("content")) or choice.get("text") or ""
 
 
 class SSEDecoder:
     """Robust Server-Sent Events decoder for streaming responses."""
 
     def __init__(self):
-        self.buffer = ""
+        self.buffer = bytearray()
         self.content_buffer = []
+        self.content_length = 0
 
     def decode_chunk(self, chunk: bytes) -> list[dict]:
         """Decode a chunk of SSE data and return parsed events."""
-        import json
-
-        try:
-            chunk_str = chunk.decode("utf-8")
-        except UnicodeDecodeError:
-            # Skip malformed chunks
+        # Accumulate raw bytes and only copy out complete lines, appending to a
+        # `str` buffer and splitting it per line is quadratic for long streams
+        buffer = self.buffer
+        buffer.extend(chunk)
+        if b"\n" not in chunk:
+            # No line was completed by this chunk
             return []
 
-        self.buffer += chunk_str
-        events = []
+        # Split all complete lines in one pass, the partial tail stays buffered
+        end = buffer.rfind(b"\n")
+        lines = buffer[:end].split(b"\n")
+        del buffer[: end + 1]
 
-        # Process complete lines
-        while "\n" in self.buffer:
-            line, self.buffer = self.buffer.split("\n", 1)
-            line = line.rstrip("\r")  # Handle CRLF
-
-            if line.startswith("data: "):
-                data_str = line[6:].strip()
-                if data_str == "[DONE]":
+        events = []
+        for line in lines:
+            if line.startswith(_SSE_DATA_PREFIX):
+                # `strip()` also drops the `\r` of CRLF line endings
+                data = line[_SSE_DATA_PREFIX_LEN:].strip()
+                if data == b"[DONE]":
                     events.append({"type": "done"})
-                elif data_str:
+                elif data:
                     try:
-                        event_data = json.loads(data_str)
+                        event_data = _json_loads(data)
                         events.append({"type": "data", "data": event_data})
-                    except json.JSONDecodeError:
-                        # Skip malformed JSON
+                    except ValueError:
+                        # Skip malformed JSON or non UTF-8 data
                         continue
 
         return events
@@ -101,36 +117,67 @@ class SSEDecoder:
         """Add content to the buffer."""
         if content:
             self.content_buffer.append(content)
+            self.content_length += len(content)
 
     def get_complete_content(self) -> str:
         """Get the complete buffered content."""
         return "".join(self.content_buffer)
 
+    def get_content_preview(self, max_length: int = 1024, keep: int = 128) -> str:
+        """Get the buffered content, or only its head and tail when it is too long.
+
+        Long content is never joined as a whole, only the parts around the edges.
+        """
+        if self.content_length <= max_length:
+            return self.get_complete_content()
+
+        head, head_length = [], 0
+        for content in self.content_buffer:
+            head.append(content)
+            head_length += len(content)
+            if head_length >= keep:
+                break
+        tail, tail_length = [], 0
+        for content in reversed(self.content_buffer):
+            tail.append(content)
+            tail_length += len(content)
+            if tail_length >= keep:
+                break
+        tail.reverse()
+        return "".join(head)[:keep] + "...[omitted]..." + "".join(tail)[-keep:]
+
 
 def _is_completion_endpoint(path: str) -> bool:
     """Check if the request is for a completion endpoint."""
-    return path in ["/v1/chat/completions", "/v1/completions"]
+    return path in _COMPLETION_PATHS
+
+
+def _scrub_media_content(messages: list) -> None:
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            filtered_content = []
+            for content_part in content:
+                if isinstance(content_part, dict):
+                    content_type = content_part.get("type", "")
+                    if content_type not in _MEDIA_CONTENT_TYPES:
+                        filtered_content.append(content_part)
+                    else:
+                        filtered_content.append(
+                            {"type": content_type, "url": "[FAKE_MEDIA_CONTENT]"}
+                        )
+                else:
+                    filtered_content.append(content_part)
+            message["content"] = filtered_content
 
 
 def serialize_request_without_media(request):
     data = request.model_dump()
 
-    if "messages" in data:
-        for message in data["messages"]:
-            if "content" in message and isinstance(message["content"], list):
-                filtered_content = []
-                for content_part in message["content"]:
-                    if isinstance(content_part, dict):
-                        content_type = content_part.get("type", "")
-                        if content_type not in ["audio_url", "image_url", "video_url"]:
-                            filtered_content.append(content_part)
-                        else:
-                            filtered_content.append(
-                                {"type": content_type, "url": "[FAKE_MEDIA_CONTENT]"}
-                            )
-                    else:
-                        filtered_content.append(content_part)
-                message["content"] = filtered_content
+    # Text-only conversations have no content parts to scrub
+    messages = data.get("messages")
+    if messages and any(isinstance(message.get("content"), list) for message in messages):
+        _scrub_media_content(messages)
 
     return data
 
@@ -144,10 +191,16 @@ def log_request():
         request: ChatCompletionRequest,
         raw_request: Optional[Request] = None,
     ):
+        if not logger.isEnabledFor(logging.INFO):
+            return await raw_create_chat_completion(self, request, raw_request)
+
         request_id = self._base_request_id(raw_request, getattr(request, "request_id", None))
         path = raw_request.url.path
         logger.info(
-            f"[request_id={request_id}] Request body of {path}:\n{json.dumps(serialize_request_without_media(request), ensure_ascii=False, indent=2)}"
+            "[request_id=%s] Request body of %s:\n%s",
+            request_id,
+            path,
+            _json_dumps_indented(serialize_request_without_media(request)),
         )
         return await raw_create_chat_completion(self, request, raw_request)
 
@@ -156,10 +209,16 @@ def log_request():
         request: CompletionRequest,
         raw_request: Optional[Request] = None,
     ):
+        if not logger.isEnabledFor(logging.INFO):
+            return await raw_create_completion(self, request, raw_request)
+
         request_id = self._base_request_id(raw_request, getattr(request, "request_id", None))
         path = raw_request.url.path
         logger.info(
-            f"[request_id={request_id}] Request body of {path}:\n{json.dumps(serialize_request_without_media(request), ensure_ascii=False, indent=2)}"
+            "[request_id=%s] Request body of %s:\n%s",
+            request_id,
+            path,
+            _json_dumps_indented(serialize_request_without_media(request)),
         )
         return await raw_create_completion(self, request, raw_request)
 
@@ -167,100 +226,290 @@ def log_request():
     OpenAIServingCompletion.create_completion = create_completion
 
 
-def _log_streaming_response_with_context(
-    request_id: str, path: str, response, response_body: list
-) -> None:
-    """Log streaming response with request context."""
-    # if not _is_completion_endpoint(path):
-    #     return
-
-    from starlette.concurrency import iterate_in_threadpool
-
-    sse_decoder = SSEDecoder()
-    chunk_count = 0
+class _StreamingResponseLogger:
+    """Decode and log the SSE chunks of a streaming response as they are sent."""
 
-    def buffered_iterator():
-        nonlocal chunk_count
+    def __init__(self, request_id: str, path: str):
+        self.request_id = request_id
+        self.path = path
+        self.sse_decoder = SSEDecoder()
+        self.chunk_count = 0
+        self.completed = False
+        self.last_progress_log = time.monotonic()
 
-        for chunk in response_body:
-            chunk_count += 1
-            yield chunk
-
-            # Parse SSE events from chunk
-            events = sse_decoder.decode_chunk(chunk)
+    def started(self) -> None:
+        logger.info(
+            "[request_id=%s] Streaming response of %s started", self.request_id, self.path
+        )
 
-            for event in events:
-                if event["type"] == "data":
-                    content = sse_decoder.extract_content(event["data"])
-                    sse_decoder.add_content(content)
-                    if chunk_count % 10 == 0:
-                        logger.info(
-                            f"[request_id={request_id}] Streaming response of {path}: {chunk_count}-th content={repr(content)}"
-                        )
-                elif event["type"] == "done":
-                    # Log complete content when done
-                    full_content = sse_decoder.get_complete_content()
-                    if len(full_content) > 1024:
-                        full_content = (
-                            full_content[:128] + "...[omitted]..." + full_content[-128:]
-                        )
+    def feed(self, chunk: bytes) -> None:
+        if not chunk:
+            return
+        self.chunk_count += 1
+        if self.completed:
+            return
+
+        # Parse SSE events from chunk
+        sse_decoder = self.sse_decoder
+        for event in sse_decoder.decode_chunk(chunk):
+            if event["type"] == "data":
+                content = sse_decoder.extract_content(event["data"])
+                sse_decoder.add_content(content)
+                now = time.monotonic()
+                if (
+                    now - self.last_progress_log >= _STREAMING_PROGRESS_LOG_INTERVAL
+                    and logger.isEnabledFor(logging.INFO)
+                ):
+                    self.last_progress_log = now
                     logger.info(
-                        f"[request_id={request_id}] Streaming response of {path} completed (chunks={chunk_count}): full_content={repr(full_content)}"
+                        "[request_id=%s] Streaming response of %s: %d-th content=%r",
+                        self.request_id,
+                        self.path,
+                        self.chunk_count,
+                        content,
                     )
+            elif event["type"] == "done":
+                self.completed = True
+                if not logger.isEnabledFor(logging.INFO):
                     return
+                # Log complete content when done
+                full_content = sse_decoder.get_content_preview()
+                logger.info(
+                    "[request_id=%s] Streaming response of %s completed (chunks=%d): full_content=%r",
+                    self.request_id,
+                    self.path,
+                    self.chunk_count,
+                    full_content,
+                )
+                return
+
+    def finish(self) -> None:
+        if self.chunk_count == 0:
+            logger.info(
+                "[request_id=%s] Response body of %s: <empty>", self.request_id, self.path
+            )
 
-    response.body_iterator = iterate_in_threadpool(buffered_iterator())
-    logger.info(
-        f"[request_id={request_id}] Streaming response of {path} started: chunks=%d",
-        len(response_body),
+
+def _scan_response_headers(raw_headers) -> tuple[str, bool]:
+    """Return the request id and whether the response is an event stream.
+
+    Both headers are read in a single pass over the raw (lowercased) headers.
+    """
+    request_id = ""
+    is_streaming = False
+    for name, value in raw_headers:
+        if name == b"x-request-id":
+            request_id = value.decode("latin-1")
+        elif name == b"content-type":
+            is_streaming = value.startswith(_SSE_MEDIA_TYPE)
+    return request_id, is_streaming
+
+
+def _report_logging_failure(request_id: str, path: str) -> None:
+    # Logging is best effort, it must never break the response itself
+    logger.warning(
+        "[request_id=%s] Failed to log response of %s, not logging it further",
+        request_id,
+        path,
+        exc_info=True,
     )
 
 
+def _log_streaming_response_with_context(request_id: str, path: str, response) -> None:
+    """Log streaming response with request context.
+
+    Chunks are passed through to the client as soon as they are produced and
+    decoded on the way, so streaming is not delayed by logging.
+    """
+    body_iterator = response.body_iterator
+    stream_logger = _StreamingResponseLogger(request_id, path)
+
+    async def logged_iterator():
+        logging_failed = False
+        async for chunk in body_iterator:
+            yield chunk
+            if logging_failed:
+                continue
+            try:
+                stream_logger.feed(chunk)
+            except Exception:
+                logging_failed = True
+                _report_logging_failure(request_id, path)
+        if not logging_failed:
+            stream_logger.finish()
+
+    response.body_iterator = logged_iterator()
+    stream_logger.started()
+
+
 def _log_non_streaming_response_with_context(
-    request_id: str, path: str, response_body: list
+    request_id: str, path: str, response_body: bytes, truncated: bool = False
 ) -> None:
     """Log non-streaming response with request context."""
     # if not _is_completion_endpoint(path):
     #     return
+    if not logger.isEnabledFor(logging.INFO):
+        return
 
-    try:
-        decoded_body = response_body[0].decode()
+    if truncated or len(response_body) > _MAX_LOGGED_BODY_BYTES:
         logger.info(
-            f"[request_id={request_id}] Non-streaming response of {path}:\n{json.dumps(json.loads(decoded_body), ensure_ascii=False, indent=2)}"
+            "[request_id=%s] Non-streaming response of %s:\n%s...[truncated]",
+            request_id,
+            path,
+            response_body[:_MAX_LOGGED_BODY_BYTES].decode("utf-8", errors="replace"),
         )
-    except UnicodeDecodeError:
+        return
+
+    try:
+        # The body is already JSON, only pay for parsing and re-indenting it when
+        # DEBUG logging asks for a human friendly layout
+        if logger.isEnabledFor(logging.DEBUG):
+            formatted_body = _json_dumps_indented(_json_loads(response_body))
+        else:
+            formatted_body = response_body.decode("utf-8")
+    except ValueError:
+        # Not UTF-8 encoded JSON
         logger.info(
-            f"[request_id={request_id}] Non-streaming response of {path}: <binary_data>"
+            "[request_id=%s] Non-streaming response of %s: <binary_data>", request_id, path
         )
+        return
+
+    logger.info(
+        "[request_id=%s] Non-streaming response of %s:\n%s",
+        request_id,
+        path,
+        formatted_body,
+    )
+
+
+def _log_buffered_response(
+    request_id: str, path: str, response_body: bytes, truncated: bool = False
+) -> None:
+    if not response_body:
+        logger.info("[request_id=%s] Response body of %s: <empty>", request_id, path)
+    else:
+        _log_non_streaming_response_with_context(
+            request_id, path, response_body, truncated
+        )
+
+
+async def _iterate_body(response_body: list):
+    # Replaying buffered chunks never blocks, no need for a threadpool hop
+    for chunk in response_body:
+        yield chunk
 
 
 async def log_response(request: Request, call_next):
     path = request.url.path
+    if not _is_completion_endpoint(path) or not logger.isEnabledFor(logging.INFO):
+        return await call_next(request)
+
     response = await call_next(request)
-    if not _is_completion_endpoint(path):
+    # Check if this is a streaming response by looking at content-type
+    response_request_id, is_streaming = _scan_response_headers(response.raw_headers)
+
+    if is_streaming:
+        _log_streaming_response_with_context(response_request_id, path, response)
         return response
 
     response_body = [section async for section in response.body_iterator]
-    response.body_iterator = iterate_in_threadpool(iter(response_body))
-    # Check if this is a streaming response by looking at content-type
-    response_request_id = response.headers.get("x-request-id", "")
-    content_type = response.headers.get("content-type", "")
-    is_streaming = content_type == "text/event-stream; charset=utf-8"
+    response.body_iterator = _iterate_body(response_body)
+    try:
+        _log_buffered_response(response_request_id, path, b"".join(response_body))
+    except Exception:
+        _report_logging_failure(response_request_id, path)
+    return response
 
-    # Log response body based on type
-    if not response_body:
-        logger.info(
-            f"[request_id={response_request_id}] Response body of {path}: <empty>"
-        )
-    elif is_streaming:
-        _log_streaming_response_with_context(
-            response_request_id, path, response, response_body
-        )
-    else:
-        _log_non_streaming_response_with_context(
-            response_request_id, path, response_body
+
+class LogResponseMiddleware:
+    """
+    ASGI middleware logging the responses of completion endpoints, it does the
+    same as `log_response` but only wraps `send`, so response chunks reach the
+    client without the task group and memory stream of `BaseHTTPMiddleware`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # Read once, requests are passed straight through when logging is off.
+        # Either the plugin's switch or vLLM's response logging switch enables it,
+        # the middleware is added by hand when only the former is set.
+        self.enabled = bool(
+            getattr(envs, "VLLM_DEBUG_LOG_API_SERVER_REQUEST_RESPONSE", False)
+            or getattr(envs, "VLLM_DEBUG_LOG_API_SERVER_RESPONSE", False)
         )
-    return response
+        if not self.enabled:
+            warnings.warn(
+                "`LogResponseMiddleware` is installed but response logging is "
+                "disabled, set `VLLM_DEBUG_LOG_API_SERVER_REQUEST_RESPONSE=1` or "
+                "`VLLM_DEBUG_LOG_API_SERVER_RESPONSE=1` to enable it"
+            )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            not self.enabled
+            or scope["type"] != "http"
+            or not _is_completion_endpoint(scope["path"])
+            or not logger.isEnabledFor(logging.INFO)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        # Fall back to the request header when the response does not carry the id,
+        # read once from the scope rather than per message
+        request_id = _scan_response_headers(scope.get("headers", ()))[0]
+        stream_logger: Optional[_StreamingResponseLogger] = None
+        # A single contiguous buffer, the body is decoded from it without a join.
+        # Only the part that will be logged is kept.
+        response_body = bytearray()
+        truncated = False
+        logging_failed = False
+
+        def log_message(message: Message) -> None:
+            nonlocal request_id, stream_logger, truncated
+
+            if message["type"] == "http.response.start":
+                response_request_id, is_streaming = _scan_response_headers(
+                    message["headers"]
+                )
+                request_id = response_request_id or request_id
+                if is_streaming:
+                    stream_logger = _StreamingResponseLogger(request_id, path)
+                    stream_logger.started()
+            elif message["type"] == "http.response.body":
+                body = message.get("body", b"")
+                more_body = message.get("more_body", False)
+                if stream_logger is not None:
+                    stream_logger.feed(body)
+                    if not more_body:
+                        stream_logger.finish()
+                else:
+                    if body and not truncated:
+                        remaining = _MAX_LOGGED_BODY_BYTES - len(response_body)
+                        if len(body) > remaining:
+                            response_body.extend(memoryview(body)[:remaining])
+                            truncated = True
+                        else:
+                            response_body.extend(body)
+                    if not more_body:
+                        _log_buffered_response(
+                            request_id, path, response_body, truncated
+                        )
+
+        async def send_with_logging(message: Message) -> None:
+            nonlocal logging_failed
+
+            await send(message)
+
+            if logging_failed:
+                return
+            try:
+                log_message(message)
+            except Exception:
+                logging_failed = True
+                _report_logging_failure(request_id, path)
+
+        await self.app(scope, receive, send_with_logging)
 
 
 # HINT: patch `FastAPI.middleware` to replace vllm's log_response middleware with our customized version
@@ -268,7 +517,8 @@ def replace_log_response_middleware():
     def patched_middleware(self, middleware_type):
         def decorator(func):
             if func.__name__ == "log_response":
-                func = log_response
+                self.add_middleware(LogResponseMiddleware)
+                return log_response
             self.add_middleware(BaseHTTPMiddleware, dispatch=func)
             return func
 
@@ -295,5 +545,5 @@ def register_log_request_response_plugin():
             replace_log_response_middleware()
         else:
             warnings.warn(
-                "We highly recommend to set the log_response middleware in vLLM cli args: `--middleware vllm_kubernetes_plugin.middleware.log_response`"
+                "We highly recommend to set the log_response middleware in vLLM cli args: `--middleware vllm_kubernetes_plugin.middleware.LogResponseMiddleware`"
             )
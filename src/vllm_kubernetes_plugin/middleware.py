@@ -1,3 +1,3 @@
-from vllm_kubernetes_plugin.log_request_response import log_response
+from vllm_kubernetes_plugin.log_request_response import LogResponseMiddleware, log_response
 
-__all__ = ["log_response"]
+__all__ = ["LogResponseMiddleware", "log_response"]
@@ -7,6 +7,7 @@ import importlib
 import inspect
 import logging
 import os
+import sys
 import uuid
 from typing import Awaitable, Callable, Optional
 
@@ -102,8 +103,11 @@ def parse_method_name(method_full_name: str) -> tuple[str, str, str]:
 
 
 def import_method(module_name: str, class_name: str, method_name: str) -> tuple:
+    # Traced modules are mostly imported by vllm already, skip the import machinery
+    module = sys.modules.get(module_name)
     try:
-        module = importlib.import_module(module_name)
+        if module is None:
+            module = importlib.import_module(module_name)
     except Exception as e:
         logger.warning(f"Failed to import module `{module_name}`: {e}!")
         return None, None, None
@@ -129,26 +133,32 @@ def get_request_id_index_in_args(original_method: Callable) -> Optional[int]:
     return None
 
 
-def _safe_get_request_id_index(method_full_name: str) -> Optional[int]:
-    """Safely get request_id index, return None if method not found"""
+def _resolve_traced_method(method_full_name: str) -> Optional[tuple]:
+    """Import a method with request_id once, return None if it can not be traced"""
     module_name, class_name, method_name = parse_method_name(method_full_name)
     module, class_obj, method = import_method(module_name, class_name, method_name)
     if module is None or class_obj is None or method is None:
         return None
-    return get_request_id_index_in_args(method)
+    request_id_index = get_request_id_index_in_args(method)
+    if request_id_index is None:
+        return None
+    return module, class_obj, method_name, method, request_id_index
 
 
 METHODS_WITH_REQUEST_ID = []
 REQUEST_ID_INDEX_IN_ARGS = {}
+# method_full_name -> (module, class_obj, method_name, method, request_id_index)
+RESOLVED_METHODS_WITH_REQUEST_ID = {}
 for root_module in envs.LOG_ROOT_MODULES.split(","):
     package_scanned_info_module = get_package_scanned_info_module(root_module)
     if package_scanned_info_module is None:
         continue
     methods_with_request_id = getattr(package_scanned_info_module, "METHODS_WITH_REQUEST_ID")
     for method_full_name in methods_with_request_id:
-        if (index := _safe_get_request_id_index(method_full_name)) is not None:
+        if (resolved := _resolve_traced_method(method_full_name)) is not None:
             METHODS_WITH_REQUEST_ID.append(method_full_name)
-            REQUEST_ID_INDEX_IN_ARGS[method_full_name] = index
+            REQUEST_ID_INDEX_IN_ARGS[method_full_name] = resolved[-1]
+            RESOLVED_METHODS_WITH_REQUEST_ID[method_full_name] = resolved
 
 
 def create_traced_method(
@@ -164,39 +174,73 @@ def create_traced_method(
 
     curr_logger = safe_import_logger(module_name)
     reset_logger_config(curr_logger)
-
-    @functools.wraps(method)
-    def wrapper(*args, **kwargs):
-        request_id = kwargs.get("request_id") or args[request_id_index]
-
-        if request_id is None:
+    log_enabled = curr_logger.isEnabledFor
+    log_info = curr_logger.info
+    start_message = "[request_id=%s] Start calling method `" + method_full_name + "`"
+    # `request_id` or `req_id`, whichever the index was found for
+    request_id_param = list(inspect.signature(method).parameters.values())[request_id_index]
+    request_id_name = request_id_param.name
+    # A defaulted request id is legitimately left out by some callers, only warn
+    # about it once per method rather than on every call
+    missing_request_id_warned = False
+
+    def log_request_id(request_id) -> None:
+        nonlocal missing_request_id_warned
+        if request_id is not None:
+            log_info(start_message, request_id)
+        elif not missing_request_id_warned:
+            missing_request_id_warned = True
             logger.warning(
-                f"`request_id` not found in method {method_full_name}, executing without tracing"
+                "`request_id` not found in method %s, executing without tracing, "
+                "further calls without it are logged at debug level",
+                method_full_name,
+            )
+        else:
+            logger.debug(
+                "`request_id` not found in method %s, executing without tracing",
+                method_full_name,
             )
-            return method(*args, **kwargs)
 
-        curr_logger.info(
-            f"[request_id={request_id}] Start calling method `{method_full_name}`"
-        )
-        result = method(*args, **kwargs)
-        return result
+    # Decide once how the request id is passed, instead of on every call
+    if request_id_param.kind is inspect.Parameter.KEYWORD_ONLY:
+
+        def log_start(args: tuple, kwargs: dict) -> None:
+            log_request_id(kwargs.get(request_id_name))
+
+    else:
+
+        def log_start(args: tuple, kwargs: dict) -> None:
+            if len(args) > request_id_index:
+                log_request_id(args[request_id_index])
+            else:
+                log_request_id(kwargs.get(request_id_name))
 
-    return wrapper
+    # Keep coroutine functions recognizable by `inspect.iscoroutinefunction`
+    if inspect.iscoroutinefunction(method):
+
+        async def wrapper(*args, **kwargs):
+            if log_enabled(logging.INFO):
+                log_start(args, kwargs)
+            return await method(*args, **kwargs)
+
+    else:
+
+        def wrapper(*args, **kwargs):
+            if log_enabled(logging.INFO):
+                log_start(args, kwargs)
+            return method(*args, **kwargs)
+
+    # `__wrapped__` keeps `inspect.signature` reporting the method's own signature
+    return functools.update_wrapper(wrapper, method)
 
 
 def patch_all_methods_with_request_id():
     """Patch all methods with request_id"""
-    for method_full_name in METHODS_WITH_REQUEST_ID:
-        module_name, class_name, method_name = parse_method_name(method_full_name)
-        module, class_obj, method = import_method(module_name, class_name, method_name)
-        if module is None or class_obj is None or method is None:
-            logger.warning(
-                f"Skipping patching for non-existent method: {method_full_name}"
-            )
-            continue
-
+    # Methods were imported and inspected once when this module was loaded
+    for method_full_name, resolved in RESOLVED_METHODS_WITH_REQUEST_ID.items():
+        module, class_obj, method_name, method, request_id_index = resolved
         traced_method = create_traced_method(
-            module, class_obj, method, REQUEST_ID_INDEX_IN_ARGS[method_full_name]
+            module, class_obj, method, request_id_index
         )
 
         try:
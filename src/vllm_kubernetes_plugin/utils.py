@@ -1,5 +1,11 @@
 import importlib
+import importlib.metadata
+import os
+import sys
 import warnings
+from functools import lru_cache
+from types import ModuleType
+from typing import Dict, Optional
 
 __all__ = [
     "get_package_version",
@@ -7,34 +13,64 @@ __all__ = [
     "get_package_scanned_info_module",
 ]
 
+# Only successful lookups are cached, failures may be transient and are retried
+_package_versions: Dict[str, str] = {}
+_package_scanned_info_modules: Dict[str, ModuleType] = {}
+
 
 def get_package_version(package_name: str) -> str:
     """Get package version"""
+    package_version = _package_versions.get(package_name)
+    if package_version is None:
+        package_version = _find_package_version(package_name)
+        if package_version is None:
+            print(f"Warning: {package_name} not found, using default version")
+            return "unknown"
+        _package_versions[package_name] = package_version
+    return package_version
+
+
+def _find_package_version(package_name: str) -> Optional[str]:
+    # For an already imported package, only look for its metadata next to it
+    # instead of scanning every `sys.path` entry
+    module = sys.modules.get(package_name)
+    module_file = vars(module).get("__file__") if module is not None else None
+    if module_file:
+        site_dir = os.path.dirname(os.path.dirname(module_file))
+        for distribution in importlib.metadata.distributions(
+            name=package_name, path=[site_dir]
+        ):
+            return distribution.version
     try:
         return importlib.metadata.version(package_name)
     except ImportError:
-        print(f"Warning: {package_name} not found, using default version")
-        return "unknown"
+        return None
 
 
+@lru_cache(maxsize=None)
 def normalized_version(version: str) -> str:
     """Normalize version string"""
     return version.replace(".", "_").replace("-", "_").replace("+", "___")
 
 
+@lru_cache(maxsize=None)
 def normalized_package_full_name(package_name: str, package_version: str) -> str:
     return f"{package_name}__v{normalized_version(package_version)}"
 
 
-def get_package_scanned_info_module(package_name: str) -> str:
+def get_package_scanned_info_module(package_name: str) -> Optional[ModuleType]:
+    package_scanned_info_module = _package_scanned_info_modules.get(package_name)
+    if package_scanned_info_module is not None:
+        return package_scanned_info_module
     package_version = get_package_version(package_name)
     package_full_name = normalized_package_full_name(package_name, package_version)
-    package_scanned_info_module = None
     try:
         package_scanned_info_module = importlib.import_module(
             f"vllm_kubernetes_plugin.package_scanned_info.{package_full_name}"
         )
-    except Exception as e:
+        _package_scanned_info_modules[package_name] = package_scanned_info_module
+    except ImportError as e:
+        # Packages without a generated scan result are expected, anything else is a bug
         warnings.warn(
             f"Failed to import module `vllm_kubernetes_plugin.package_scanned_info.{package_full_name}`: {e}"
         )
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test cases for response logging
+
+This module contains tests for `LogResponseMiddleware` driven through starlette's
+`TestClient`, covering streaming and non-streaming completion responses, and for
+the `SSEDecoder` the streaming responses are decoded with.
+"""
+
+import json
+import logging
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+from vllm_kubernetes_plugin import log_request_response
+from vllm_kubernetes_plugin.log_request_response import (
+    LogResponseMiddleware,
+    SSEDecoder,
+    add_log_request_response_env_vars,
+)
+
+
+class _RecordCollector(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def collected_logs(monkeypatch):
+    """Enable response logging and collect what the middleware logs."""
+    add_log_request_response_env_vars()
+    monkeypatch.setenv("VLLM_DEBUG_LOG_API_SERVER_REQUEST_RESPONSE", "1")
+
+    logger = log_request_response.logger
+    collector = _RecordCollector()
+    original_level = logger.level
+    logger.addHandler(collector)
+    logger.setLevel(logging.INFO)
+    try:
+        yield collector.messages
+    finally:
+        logger.removeHandler(collector)
+        logger.setLevel(original_level)
+
+
+def _sse_chunks(choices):
+    for choice in choices:
+        yield "data: " + json.dumps({"choices": [choice]}) + "\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def _make_client(choices):
+    async def chat_completions(request):
+        return StreamingResponse(
+            _sse_chunks(choices),
+            media_type="text/event-stream",
+            headers={"X-Request-Id": "stream-id"},
+        )
+
+    async def completions(request):
+        return JSONResponse({"choices": choices}, headers={"X-Request-Id": "json-id"})
+
+    app = Starlette(
+        routes=[
+            Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+            Route("/v1/completions", completions, methods=["POST"]),
+        ]
+    )
+    return TestClient(LogResponseMiddleware(app))
+
+
+def test_streaming_response_is_logged(collected_logs):
+    """The content of all chunks is logged once the stream is done"""
+    choices = [{"delta": {"content": "Hello"}}, {"delta": {"content": " world"}}]
+    with _make_client(choices) as client:
+        response = client.post("/v1/chat/completions", json={})
+
+    assert response.status_code == 200
+    assert response.text == "".join(_sse_chunks(choices))
+    assert any(
+        "[request_id=stream-id]" in message and "'Hello world'" in message
+        for message in collected_logs
+    ), collected_logs
+
+
+def test_non_streaming_response_is_logged(collected_logs):
+    """The JSON body is logged as it was sent"""
+    choices = [{"text": "Hello world"}]
+    with _make_client(choices) as client:
+        response = client.post("/v1/completions", json={})
+
+    assert response.status_code == 200
+    assert response.json() == {"choices": choices}
+    assert any(
+        "[request_id=json-id]" in message and "Hello world" in message
+        for message in collected_logs
+    ), collected_logs
+
+
+def test_logging_failure_does_not_break_streaming_response(collected_logs):
+    """A chunk the logger cannot decode still reaches the client in full"""
+    choices = ["not a dict", {"delta": {"content": "after"}}]
+    with _make_client(choices) as client:
+        response = client.post("/v1/chat/completions", json={})
+
+    assert response.status_code == 200
+    assert response.text == "".join(_sse_chunks(choices))
+    failures = [m for m in collected_logs if "Failed to log response" in m]
+    assert len(failures) == 1, collected_logs
+
+
+def test_sse_decoder_crlf_line_endings():
+    """Events terminated by CRLF decode like LF terminated ones"""
+    decoder = SSEDecoder()
+    events = decoder.decode_chunk(
+        b'data: {"choices": [{"text": "a"}]}\r\n\r\ndata: [DONE]\r\n\r\n'
+    )
+
+    assert events == [
+        {"type": "data", "data": {"choices": [{"text": "a"}]}},
+        {"type": "done"},
+    ]
+    assert decoder.buffer == b""
+
+
+def test_sse_decoder_event_split_across_chunks():
+    """An event is only decoded once the chunk completing its line arrives"""
+    decoder = SSEDecoder()
+    event = b'data: {"choices": [{"delta": {"content": "hi"}}]}\n\n'
+
+    assert decoder.decode_chunk(event[:10]) == []
+    assert decoder.decode_chunk(event[10:30]) == []
+    events = decoder.decode_chunk(event[30:])
+
+    assert events == [{"type": "data", "data": {"choices": [{"delta": {"content": "hi"}}]}}]
+    assert decoder.extract_content(events[0]["data"]) == "hi"
+    assert decoder.buffer == b""
+
+
+def test_sse_decoder_trailing_partial_line():
+    """A trailing partial line stays buffered until it is completed"""
+    decoder = SSEDecoder()
+    events = decoder.decode_chunk(
+        b'data: {"choices": [{"text": "a"}]}\n\ndata: {"choices": [{"te'
+    )
+
+    assert events == [{"type": "data", "data": {"choices": [{"text": "a"}]}}]
+    assert decoder.buffer == b'data: {"choices": [{"te'
+
+    events = decoder.decode_chunk(b'xt": "b"}]}\n\n')
+    assert events == [{"type": "data", "data": {"choices": [{"text": "b"}]}}]
+    assert decoder.buffer == b""
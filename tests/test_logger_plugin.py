@@ -5,10 +5,17 @@ Test cases for logger plugin functionality
 This module contains tests for the non-invasive extension of vllm.envs module.
 """
 
+import importlib
+import logging
+import multiprocessing
 import os
+import sys
 import pytest
+from vllm_kubernetes_plugin.common import logger_plugin
 from vllm_kubernetes_plugin.common.logger_plugin import (
     add_logger_env_vars,
+    get_log_file_name,
+    reset_logger_config,
 )
 
 
@@ -57,7 +64,8 @@ def test_non_invasive_envs_extension():
             if key in os.environ:
                 del os.environ[key]
 
-        # Since these are lambda functions, they will re-read environment variables
+        # Values are read once and cached, re-adding the variables re-reads them
+        add_logger_env_vars()
         assert envs.APP_NAME == "standalone"  # Default value
         assert envs.VLLM_LOG_FILENAME == "server.log"  # Default value
         assert envs.VLLM_LOG_FILE_MAX_BYTES == 8388608  # Default 8MB
@@ -133,3 +141,91 @@ def test_log_root_modules_parsing():
     finally:
         if "LOG_ROOT_MODULES" in os.environ:
             del os.environ["LOG_ROOT_MODULES"]
+
+
+def _log_in_forked_child(logger_name: str) -> None:
+    logger = logging.getLogger(logger_name)
+    logger.info("child info")
+    logger.error("child error")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_forked_child_records_are_written():
+    """
+    Test that records logged by a forked child reach the log file
+
+    Forked processes exit through `os._exit`, without exit hooks flushing buffers.
+    """
+    os.environ["VLLM_LOG_FILENAME"] = f"fork-test-{os.getpid()}.log"
+    logger_plugin._shared_handlers = None
+    try:
+        add_logger_env_vars()
+        logger = logging.getLogger("vllm_kubernetes_plugin.tests.fork")
+        reset_logger_config(logger)
+        logger.info("parent before fork")
+
+        process = multiprocessing.get_context("fork").Process(
+            target=_log_in_forked_child, args=(logger.name,)
+        )
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+
+        logger.info("parent after fork")
+        logger_plugin._stop_queue_listener()
+        logger_plugin._queue_handler.target.flush()
+
+        with open(get_log_file_name(), encoding="utf8") as f:
+            content = f.read()
+        assert "child info" in content
+        assert "child error" in content
+        # Records buffered before the fork are written by the parent only
+        assert content.count("parent before fork") == 1
+        assert content.count("parent after fork") == 1
+    finally:
+        logger_plugin._stop_queue_listener()
+        if logger_plugin._queue_handler is not None:
+            logger_plugin._queue_handler.target.close()
+        logger_plugin._shared_handlers = None
+        if os.path.exists(get_log_file_name()):
+            os.remove(get_log_file_name())
+        del os.environ["VLLM_LOG_FILENAME"]
+        add_logger_env_vars()
+
+
+def test_module_logger_configured_on_import(tmp_path, monkeypatch):
+    """
+    Test that the logger of a module imported after setup is configured once
+
+    The module names its logger differently from itself and sets its own level,
+    so configuring the logger by module name in advance would miss it.
+    """
+    module_name = "finder_fixture_module"
+    (tmp_path / f"{module_name}.py").write_text(
+        "import logging\n"
+        "logger = logging.getLogger('finder_fixture.custom')\n"
+        "logger.setLevel(logging.CRITICAL)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    handlers = [logging.StreamHandler()]
+    finder = logger_plugin._ModuleLoggerConfigFinder(
+        [module_name], handlers, logging.INFO
+    )
+    sys.meta_path.insert(0, finder)
+    try:
+        module = importlib.import_module(module_name)
+        logger = module.logger
+        assert logger.handlers == handlers
+        assert logger.level == logging.INFO
+        assert not logger.propagate
+        # The loader is left untouched once the module is executed
+        assert "exec_module" not in vars(module.__spec__.loader)
+
+        module = importlib.reload(module)
+        assert module.logger is logger
+        assert logger.handlers == handlers
+    finally:
+        sys.meta_path.remove(finder)
+        sys.modules.pop(module_name, None)
+        logging.getLogger("finder_fixture.custom").handlers.clear()
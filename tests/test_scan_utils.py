@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Test cases for the package scanning utilities of the build scripts
+
+The scans are compared with the import-based scans they replaced, on a fixture
+package written to a temporary directory.
+"""
+
+import importlib
+import inspect
+import logging
+import pkgutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.utils import (  # noqa: E402
+    find_logger_modules,
+    find_methods_with_request_id,
+)
+
+FIXTURE_PACKAGE = "scan_fixture_pkg"
+FIXTURE_SOURCES = {
+    "__init__.py": "",
+    "plain.py": "import logging\nlogger = logging.getLogger(__name__)\n",
+    "annotated.py": (
+        "import logging\nlogger: logging.Logger = logging.getLogger(__name__)\n"
+    ),
+    "custom_name.py": "import logging\nlogger = logging.getLogger('custom.name')\n",
+    "reexported.py": f"from {FIXTURE_PACKAGE}.plain import logger\n",
+    "not_a_logger.py": "logger = 'not a logger'\n",
+    "reexported_not_a_logger.py": (
+        f"from {FIXTURE_PACKAGE}.not_a_logger import logger\n"
+    ),
+    "function_logger.py": (
+        "import logging\n\ndef f():\n    logger = logging.getLogger(__name__)\n"
+    ),
+    "no_logger.py": "import logging\n",
+    "sub/__init__.py": "",
+    "sub/conditional.py": (
+        "import logging, sys\n"
+        "if sys.version_info >= (3,):\n"
+        "    logger = logging.getLogger(__name__)\n"
+    ),
+    "sub/fallback.py": (
+        "import logging\n"
+        "try:\n"
+        "    import module_which_does_not_exist\n"
+        "except ImportError:\n"
+        "    logger = logging.getLogger(__name__)\n"
+    ),
+    "sub/with_block.py": (
+        "import logging, warnings\n"
+        "with warnings.catch_warnings():\n"
+        "    logger = logging.getLogger(__name__)\n"
+    ),
+    "engine.py": (
+        "class Base:\n"
+        "    def abort(self, request_id): pass\n"
+        "    @classmethod\n"
+        "    def cm(cls, req_id): pass\n"
+        "    @staticmethod\n"
+        "    def sm(*, request_id): pass\n"
+        "    def shadowed(self, request_id): pass\n"
+        "    def __init__(self, request_id): pass\n"
+        "    def other(self, prompt): pass\n"
+        "if True:\n"
+        "    class Conditional:\n"
+        "        def add(self, request_id): pass\n"
+    ),
+    "sub/child.py": (
+        f"from {FIXTURE_PACKAGE}.engine import Base\n"
+        "class Child(Base):\n"
+        "    def shadowed(self): pass\n"
+        "    def own(self, request_id): pass\n"
+    ),
+}
+
+
+@pytest.fixture
+def fixture_package(tmp_path, monkeypatch):
+    """Write the fixture package and make it importable"""
+    for relative_path, source in FIXTURE_SOURCES.items():
+        path = tmp_path / FIXTURE_PACKAGE / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    yield FIXTURE_PACKAGE
+    for module_name in list(sys.modules):
+        if module_name.split(".")[0] == FIXTURE_PACKAGE:
+            del sys.modules[module_name]
+
+
+def _baseline_find_logger_modules(root_module_name: str) -> list:
+    """The import-based logger scan `find_logger_modules` replaced"""
+    root_module = importlib.import_module(root_module_name)
+    module_names = [root_module_name]
+    for _, module_name, _ in pkgutil.walk_packages(
+        root_module.__path__, prefix=f"{root_module_name}."
+    ):
+        module_names.append(module_name)
+    return sorted(
+        module_name
+        for module_name in module_names
+        if isinstance(
+            vars(importlib.import_module(module_name)).get("logger"), logging.Logger
+        )
+    )
+
+
+def _baseline_find_methods_with_request_id(root_module_name: str) -> list:
+    """The import-based request_id method scan before its optimizations"""
+    root_module = importlib.import_module(root_module_name)
+    module_names = [root_module_name]
+    for _, module_name, _ in pkgutil.walk_packages(
+        root_module.__path__, prefix=f"{root_module_name}."
+    ):
+        module_names.append(module_name)
+    found_methods = set()
+    for module_name in module_names:
+        module = importlib.import_module(module_name)
+        for class_name, class_obj in inspect.getmembers(module, inspect.isclass):
+            if class_obj.__module__ != module_name:
+                continue
+            for method_name, method_obj in inspect.getmembers(class_obj):
+                if not callable(method_obj) or method_name == "__init__":
+                    continue
+                try:
+                    parameters = inspect.signature(method_obj).parameters
+                except (ValueError, TypeError):
+                    continue
+                if "request_id" in parameters or "req_id" in parameters:
+                    found_methods.add(f"{module_name}.{class_name}:{method_name}")
+    return sorted(found_methods)
+
+
+def test_find_logger_modules_matches_baseline(fixture_package):
+    """
+    Test that the ast based logger scan finds the same modules as importing them
+    """
+    expected = _baseline_find_logger_modules(fixture_package)
+    assert f"{fixture_package}.reexported" in expected
+    assert f"{fixture_package}.sub.conditional" in expected
+
+    assert find_logger_modules(fixture_package) == expected
+
+
+def test_find_logger_modules_imports_only_ambiguous_modules(fixture_package):
+    """
+    Test that only modules not assigning 'logger' from a factory call are imported
+    """
+    find_logger_modules(fixture_package)
+
+    imported = {
+        module_name
+        for module_name in sys.modules
+        if module_name.startswith(f"{fixture_package}.")
+    }
+    assert f"{fixture_package}.reexported" in imported
+    assert f"{fixture_package}.plain" in imported  # imported by the re-export
+    assert f"{fixture_package}.sub.conditional" not in imported
+    assert f"{fixture_package}.function_logger" not in imported
+
+
+def test_find_methods_with_request_id_matches_baseline(fixture_package):
+    """
+    Test that the method scan finds the same methods as the baseline scan,
+    including methods subclasses inherit
+    """
+    expected = _baseline_find_methods_with_request_id(fixture_package)
+    assert f"{fixture_package}.sub.child.Child:abort" in expected
+    assert f"{fixture_package}.sub.child.Child:cm" in expected
+
+    actual = find_methods_with_request_id(fixture_package, skip_prefixes=())
+    assert actual == expected